@@ -5,9 +5,9 @@ from django.contrib.admin.apps import AdminConfig
 class EggslistAdminSite(admin.AdminSite):
     @property
     def site_header(self):
-        from eggslist.site_configuration.models import SiteBranding
+        from eggslist.site_configuration.branding import get_branding
 
-        return f"{SiteBranding.get_solo().site_name} Admin"
+        return f"{get_branding().site_name} Admin"
 
     @site_header.setter
     def site_header(self, value):
@@ -0,0 +1,57 @@
+import random
+import time
+import typing as t
+
+from django.conf import settings
+from django.db import connection
+from redis.exceptions import RedisError
+
+from eggslist.utils.request_metrics import RequestMetrics, collect_request_metrics, measure
+from eggslist.utils.request_metrics_storage import RequestMetricsStorage
+
+if t.TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+
+def _measure_query(execute, sql, params, many, context):
+    with measure("db"):
+        return execute(sql, params, many, context)
+
+
+class RequestMetricsMiddleware:
+    """
+    Count DB queries, cache and Redis calls of a sampled share of requests
+    (`REQUEST_METRICS_SAMPLE_RATE`) and add their wall time to per-view totals.
+    Totals are served in Prometheus text format by `api/metrics`.
+    """
+
+    def __init__(self, get_response: t.Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: "HttpRequest") -> "HttpResponse":
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        started_at = time.perf_counter()
+        with collect_request_metrics() as metrics, connection.execute_wrapper(_measure_query):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started_at) * 1000
+
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response["Server-Timing"] = self.get_server_timing(metrics, total_ms)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else "unresolved"
+        try:
+            RequestMetricsStorage.add(view_name, total_ms=total_ms, metrics=metrics)
+        except RedisError:
+            pass
+        return response
+
+    def get_server_timing(self, metrics: RequestMetrics, total_ms: float) -> str:
+        timings = [
+            f'{kind};dur={metrics.durations[kind]:.2f};desc="{metrics.counts[kind]} calls"'
+            for kind in sorted(metrics.counts)
+        ]
+        timings.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(timings)
@@ -0,0 +1,92 @@
+import threading
+import time
+import typing as t
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from redis.exceptions import RedisError
+
+from eggslist.utils.request_metrics_storage import RequestMetricsStorage
+
+# Cheap, frequently polled endpoints
+_LOW_RATE_PATH_PREFIXES = (
+    "/api/health/",
+    "/api/metrics/",
+    "/api/site-configuration/",
+    "/api/store/categories",
+)
+# Money moving endpoints, every trace is worth keeping
+_HIGH_RATE_PATH_PREFIXES = (
+    "/api/stripe-webhooks",
+    "/api/users/connect-stripe",
+)
+_HIGH_RATE_PATH_SUFFIXES = ("/purchase",)
+
+_slow_views: t.FrozenSet[str] = frozenset()
+_slow_views_loaded_at: t.Optional[float] = None
+_slow_views_lock = threading.Lock()
+
+
+def _load_slow_views() -> t.FrozenSet[str]:
+    slow_views = set()
+    recent = RequestMetricsStorage.get_recent(window_seconds=settings.SENTRY_TRACES_SLOW_WINDOW)
+    for view_name, values in recent.items():
+        requests = values.get("requests")
+        if requests and values["total_ms"] / requests >= settings.SENTRY_TRACES_SLOW_THRESHOLD_MS:
+            slow_views.add(view_name)
+    return frozenset(slow_views)
+
+
+def get_slow_views() -> t.FrozenSet[str]:
+    """
+    Views whose mean latency of sampled requests (see `RequestMetricsMiddleware`)
+    over the last `SENTRY_TRACES_SLOW_WINDOW` seconds is over
+    `SENTRY_TRACES_SLOW_THRESHOLD_MS`. Reloaded from Redis once
+    per `SENTRY_TRACES_SLOW_VIEWS_TTL` seconds in each worker process.
+    """
+    global _slow_views, _slow_views_loaded_at
+
+    loaded_at = _slow_views_loaded_at
+    ttl = settings.SENTRY_TRACES_SLOW_VIEWS_TTL
+    if loaded_at is not None and time.monotonic() - loaded_at < ttl:
+        return _slow_views
+
+    with _slow_views_lock:
+        if _slow_views_loaded_at is loaded_at:
+            try:
+                _slow_views = _load_slow_views()
+            except RedisError:
+                pass
+            _slow_views_loaded_at = time.monotonic()
+        return _slow_views
+
+
+def _is_slow_path(path: str) -> bool:
+    try:
+        view_name = resolve(path).view_name
+    except Resolver404:
+        return False
+    return view_name in get_slow_views()
+
+
+def traces_sampler(sampling_context: t.Dict[str, t.Any]) -> float:
+    """
+    Sample rate of a Sentry transaction by route. Latency is not known when
+    a transaction starts, so routes which are slow on average are always sampled.
+    """
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+
+    environ = sampling_context.get("wsgi_environ")
+    if environ is None:
+        return settings.SENTRY_TRACES_SAMPLE_RATE
+
+    path = environ.get("PATH_INFO", "")
+    if path.startswith(_LOW_RATE_PATH_PREFIXES):
+        return settings.SENTRY_TRACES_LOW_SAMPLE_RATE
+    if path.startswith(_HIGH_RATE_PATH_PREFIXES) or path.endswith(_HIGH_RATE_PATH_SUFFIXES):
+        return settings.SENTRY_TRACES_HIGH_SAMPLE_RATE
+    if _is_slow_path(path):
+        return 1.0
+    return settings.SENTRY_TRACES_SAMPLE_RATE
@@ -3,6 +3,7 @@ from datetime import timedelta
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
+from app.sentry import traces_sampler
 from app.settings import APP_DIR, env
 
 ########################
@@ -75,6 +76,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "app.middleware.request_metrics.RequestMetricsMiddleware",
     "app.middleware.location.LocationMiddleware",
 ]
 
@@ -102,7 +104,7 @@ DATABASES = {
 REDIS_URL = env("REDIS_URL", default="redis://127.0.0.1:6379/0")
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "BACKEND": "eggslist.utils.cache_backends.InstrumentedRedisCache",
         "LOCATION": REDIS_URL,
         "TIMEOUT": 1200,
     }
@@ -195,6 +197,22 @@ CORS_ALLOW_CREDENTIALS = True
 GEOIP_PATH = str(APP_DIR.path("app", "geolite2"))
 GEO_ZIP_PATH = f"{GEOIP_PATH}/uszips_states.csv"
 GEO_CITIES_PATH = f"{GEOIP_PATH}/us_cities.csv"
+# IP network -> city lookups are cached in Redis and in a per-process LRU cache
+IP_LOCATION_CACHE_TIMEOUT = env.int("IP_LOCATION_CACHE_TIMEOUT", default=60 * 60 * 24)
+IP_LOCATION_LOCAL_CACHE_SIZE = env.int("IP_LOCATION_LOCAL_CACHE_SIZE", default=10000)
+# In-process grid over city and zip code points used to find the closest city to coordinates
+# (GeoIP city names not in the dataset, `locate-by-coordinates` endpoint). Distances in degrees
+NEAREST_CITY_MAX_DISTANCE = env.float("NEAREST_CITY_MAX_DISTANCE", default=0.5)
+NEAREST_CITY_INDEX_CELL_SIZE = env.float("NEAREST_CITY_INDEX_CELL_SIZE", default=0.25)
+NEAREST_CITY_INDEX_TTL = env.int("NEAREST_CITY_INDEX_TTL", default=60 * 60)
+# Seconds between checks whether the location dataset was reloaded (`load_locations`)
+NEAREST_CITY_INDEX_CHECK_INTERVAL = env.int("NEAREST_CITY_INDEX_CHECK_INTERVAL", default=60)
+
+# Share of requests whose DB queries, cache and Redis calls are counted and timed.
+# Totals per view are served in Prometheus format by `api/metrics/` to `REQUEST_METRICS_TOKEN`
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=0.1)
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=False)
+REQUEST_METRICS_TOKEN = env("REQUEST_METRICS_TOKEN", default="")
 
 #########################
 # Rest Framework Settings
@@ -219,6 +237,10 @@ AUTHENTICATION_BACKENDS = ("eggslist.users.backends.EggslistAuthenticationBacken
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 USER_LOCATION_COOKIE_NAME = "user_location_id"
+# In-process cache of user locations in front of Redis. Another worker may serve
+# a previous location for up to TTL seconds after the user changes it.
+USER_LOCATION_LOCAL_CACHE_SIZE = env.int("USER_LOCATION_LOCAL_CACHE_SIZE", default=10000)
+USER_LOCATION_LOCAL_CACHE_TTL = env.int("USER_LOCATION_LOCAL_CACHE_TTL", default=10)  # seconds
 SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
 SESSION_COOKIE_DOMAIN = env("SESSION_COOKIE_DOMAIN", default="localhost")
 # CSRF_COOKIE_DOMAIN = ".eggslist.com"
@@ -242,6 +264,18 @@ if not EMAIL_HOST:
 else:
     EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
+# Seconds between checks whether the process-local branding snapshot used by emails is stale
+BRANDING_SNAPSHOT_TTL = env.int("BRANDING_SNAPSHOT_TTL", default=30)
+
+# `send_mailing` only queues emails, `send_queued_emails` delivers them in batches.
+# A failed email is retried after the delay (seconds) doubled on every attempt
+EMAIL_QUEUE_BATCH_SIZE = env.int("EMAIL_QUEUE_BATCH_SIZE", default=50)
+# Recipients of a mailing read, rendered and queued at a time
+EMAIL_MAILING_CHUNK_SIZE = env.int("EMAIL_MAILING_CHUNK_SIZE", default=500)
+EMAIL_QUEUE_MAX_ATTEMPTS = env.int("EMAIL_QUEUE_MAX_ATTEMPTS", default=6)
+EMAIL_QUEUE_RETRY_DELAY = env.int("EMAIL_QUEUE_RETRY_DELAY", default=60)
+EMAIL_QUEUE_KEEP_SENT_DAYS = env.int("EMAIL_QUEUE_KEEP_SENT_DAYS", default=7)
+
 
 ######################
 # Social Auth Settings
@@ -271,14 +305,27 @@ STRIPE_CONNECT_RETURN_URL = env("STRIPE_CONNECT_RETURN_URL", default="profile")
 ######################
 # Sentry
 ######################
+# Trace sample rates by route (see `app.sentry.traces_sampler`): health check and site
+# configuration get the low rate, checkout and Stripe endpoints the high one. Views whose
+# mean latency over the last `SENTRY_TRACES_SLOW_WINDOW` seconds (up to an hour)
+# is over the threshold are always traced.
+# Profiling rate is relative to traced requests
+SENTRY_TRACES_SAMPLE_RATE = env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.1)
+SENTRY_TRACES_LOW_SAMPLE_RATE = env.float("SENTRY_TRACES_LOW_SAMPLE_RATE", default=0.01)
+SENTRY_TRACES_HIGH_SAMPLE_RATE = env.float("SENTRY_TRACES_HIGH_SAMPLE_RATE", default=1.0)
+SENTRY_TRACES_SLOW_THRESHOLD_MS = env.int("SENTRY_TRACES_SLOW_THRESHOLD_MS", default=1000)
+SENTRY_TRACES_SLOW_VIEWS_TTL = env.int("SENTRY_TRACES_SLOW_VIEWS_TTL", default=60)
+SENTRY_TRACES_SLOW_WINDOW = env.int("SENTRY_TRACES_SLOW_WINDOW", default=15 * 60)
+SENTRY_PROFILES_SAMPLE_RATE = env.float("SENTRY_PROFILES_SAMPLE_RATE", default=0.1)
+
 sentry_sdk.init(
     dsn=env("SENTRY_URL", default=""),
     integrations=[
         DjangoIntegration(),
     ],
-    traces_sample_rate=1.0,
+    traces_sampler=traces_sampler,
     send_default_pii=True,
-    profiles_sample_rate=1.0,
+    profiles_sample_rate=SENTRY_PROFILES_SAMPLE_RATE,
 )
 
 ###########################
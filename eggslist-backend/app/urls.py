@@ -1,8 +1,11 @@
 from django.conf import settings
 from django.conf.urls import static
 from django.contrib import admin
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.urls import include, path
+from django.utils.crypto import constant_time_compare
+
+from eggslist.utils.request_metrics_storage import RequestMetricsStorage
 
 
 def trigger_error(request):
@@ -13,10 +16,22 @@ def health_check(request):
     return JsonResponse({"status": "ok"})
 
 
+def request_metrics(request):
+    if not settings.REQUEST_METRICS_TOKEN or not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.REQUEST_METRICS_TOKEN}"
+    ):
+        raise Http404
+    return HttpResponse(
+        RequestMetricsStorage.render_prometheus(sample_rate=settings.REQUEST_METRICS_SAMPLE_RATE),
+        content_type="text/plain; version=0.0.4",
+    )
+
+
 urlpatterns = [
     path(settings.ADMIN_URL, admin.site.urls),
     path("api/", include("eggslist.urls", namespace="eggslist")),
     path("api/health/", health_check, name="health-check"),
+    path("api/metrics/", request_metrics, name="request-metrics"),
     path("ckeditor5/", include("django_ckeditor_5.urls")),
 ]
 
@@ -4,3 +4,7 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 application = get_wsgi_application()
+
+from eggslist.users.nearest_city import start_nearest_city_index_refresher  # noqa: E402
+
+start_nearest_city_index_refresher()
@@ -93,3 +93,8 @@ class SiteBrandingSerializer(serializers.ModelSerializer):
 
     def get_color_text(self, obj):
         return self._get_colors(obj)["text"]
+
+
+class LocationAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=64, trim_whitespace=True)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=8)
@@ -9,6 +9,7 @@ urlpatterns = [
     path("location/states", views.LocationStateListAPIView.as_view(), name="location-states"),
     path("location/cities", views.LocationCityListAPIView.as_view(), name="location-cities"),
     path("location/zip-codes", views.LocationZipCodeListAPIView.as_view(), name="location-zip-codes"),
+    path("location/autocomplete", views.LocationAutocompleteAPIView.as_view(), name="location-autocomplete"),
     path("testimonials", views.TestimonialListAPIView.as_view(), name="testimonials"),
     path("about/faqs", views.FAQListAPIView.as_view(), name="about-faqs"),
     path("about/team-members", views.TeamMemberAPIView.as_view(), name="about-team-members"),
@@ -9,7 +9,8 @@ from rest_framework.views import APIView
 from eggslist.site_configuration import filters, models
 from eggslist.site_configuration.api import serializers
 from eggslist.site_configuration.models import BRANDING_CACHE_KEY
-from eggslist.utils.views.mixins import CacheListAPIMixin
+from eggslist.users.user_location_storage import UserLocationStorage
+from eggslist.utils.views.mixins import AnonymousUserIdAPIMixin, CacheListAPIMixin
 
 
 class LocationStateListAPIView(CacheListAPIMixin, generics.ListAPIView):
@@ -20,6 +21,7 @@ class LocationStateListAPIView(CacheListAPIMixin, generics.ListAPIView):
 
 class LocationCityListAPIView(CacheListAPIMixin, generics.ListAPIView):
     cache_key = "location_cities"
+    cache_gzip = True
     serializer_class = serializers.CityLocationSerializer
     queryset = models.LocationCity.objects.all()
     filter_backends = (DjangoFilterBackend, SearchFilter)
@@ -27,13 +29,52 @@ class LocationCityListAPIView(CacheListAPIMixin, generics.ListAPIView):
     filterset_class = filters.LocationCityFilter
 
 
-class LocationZipCodeListAPIView(generics.ListAPIView):
+class LocationZipCodeListAPIView(CacheListAPIMixin, generics.ListAPIView):
+    cache_key = "location_zip_codes"
+    cache_gzip = True
     serializer_class = serializers.ZipCodeLocationSerializer
     queryset = models.LocationZipCode.objects.all()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = filters.LocationZipCodeFilter
 
 
+class LocationAutocompleteAPIView(AnonymousUserIdAPIMixin, APIView):
+    """
+    Typeahead over cities and zip codes. Only a prefix of the city name (`city|state`
+    lookup key) or of the zip code is matched, so both queries use a
+    `varchar_pattern_ops` index. Matches closest to the user location go first.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        query_serializer = serializers.LocationAutocompleteQuerySerializer(
+            data=request.query_params
+        )
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data["q"]
+        limit = query_serializer.validated_data["limit"]
+
+        city, _, _ = UserLocationStorage.get_user_location(user_id=self.get_user_id())
+        point = city.location if city is not None else None
+
+        if query.isdigit():
+            cities = []
+            zip_codes = models.LocationZipCode.objects.autocomplete(
+                query, point=point, limit=limit
+            )
+        else:
+            cities = models.LocationCity.objects.autocomplete(query, point=point, limit=limit)
+            zip_codes = []
+
+        return Response(
+            {
+                "cities": serializers.CityLocationSerializer(cities, many=True).data,
+                "zip_codes": serializers.ZipCodeLocationSerializer(zip_codes, many=True).data,
+            }
+        )
+
+
 class TestimonialListAPIView(generics.ListAPIView):
     serializer_class = serializers.TestimonialSerializer
     queryset = models.Testimonial.objects.all()
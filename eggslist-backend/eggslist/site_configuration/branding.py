@@ -0,0 +1,58 @@
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from eggslist.utils.view_cache import get_view_cache_generation
+
+BRANDING_SNAPSHOT_CACHE_KEY = "site_branding_snapshot"
+
+
+@dataclass(frozen=True)
+class BrandingSnapshot:
+    site_name: str
+
+
+_snapshot: t.Optional[BrandingSnapshot] = None
+_snapshot_generation: t.Optional[int] = None
+_snapshot_checked_at: t.Optional[float] = None
+_snapshot_lock = threading.Lock()
+
+
+def _load_snapshot() -> BrandingSnapshot:
+    SiteBranding = apps.get_model("site_configuration.SiteBranding")
+    branding = SiteBranding.get_solo()
+    return BrandingSnapshot(site_name=branding.site_name)
+
+
+def get_branding() -> BrandingSnapshot:
+    """
+    Process-local copy of the branding used by emails, webhooks and the admin.
+    Its generation is compared with the shared one (moved by `clear_branding_cache`)
+    once per `BRANDING_SNAPSHOT_TTL` seconds, the database is read only
+    when the branding has been changed.
+    """
+    global _snapshot, _snapshot_generation, _snapshot_checked_at
+
+    checked_at = _snapshot_checked_at
+    if checked_at is not None and time.monotonic() - checked_at < settings.BRANDING_SNAPSHOT_TTL:
+        return _snapshot
+
+    with _snapshot_lock:
+        if _snapshot_checked_at is not checked_at:
+            return _snapshot
+
+        try:
+            generation = get_view_cache_generation(BRANDING_SNAPSHOT_CACHE_KEY)
+        except RedisError:
+            # Keep serving the current snapshot until Redis is back
+            generation = _snapshot_generation
+        if _snapshot is None or generation != _snapshot_generation:
+            _snapshot = _load_snapshot()
+            _snapshot_generation = generation
+        _snapshot_checked_at = time.monotonic()
+        return _snapshot
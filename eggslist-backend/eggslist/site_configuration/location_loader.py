@@ -0,0 +1,225 @@
+import csv
+import io
+import typing as t
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from eggslist.site_configuration.models import (
+    LOCATION_VIEW_CACHE_KEYS,
+    LocationCity,
+    LocationCountry,
+    LocationState,
+    LocationZipCode,
+)
+from eggslist.store.catalog_cache import bump_catalog_generation
+from eggslist.users.nearest_city import invalidate_nearest_city_index
+from eggslist.utils.view_cache import invalidate_view_cache
+
+CITY_COLUMN = "city"
+CITY_SLUG_COLUMN = "city_state"
+CITY_LONGITUDE_COLUMN = "city_lng"
+CITY_LATITUDE_COLUMN = "city_lat"
+STATE_ID_COLUMN = "state_id"
+STATE_NAME_COLUMN = "state_name"
+ZIP_COLUMN = "zip"
+ZIP_LONGITUDE_COLUMN = "lng"
+ZIP_LATITUDE_COLUMN = "lat"
+
+
+@dataclass
+class LocationDataset:
+    # state id -> state full name
+    states: t.Dict[str, str] = field(default_factory=dict)
+    # city slug -> (city name, state id, longitude, latitude)
+    cities: t.Dict[str, t.Tuple[str, str, float, float]] = field(default_factory=dict)
+    # zip code -> (city slug, longitude, latitude)
+    zip_codes: t.Dict[str, t.Tuple[str, float, float]] = field(default_factory=dict)
+
+
+@dataclass
+class LocationLoadResult:
+    created_states: int
+    updated_states: int
+    upserted_cities: int
+    upserted_zip_codes: int
+    moved_products: int
+
+
+def read_location_dataset(path: str) -> LocationDataset:
+    """
+    Read `uszips_states.csv` in a single streaming pass. A city is taken from the
+    first zip code row which mentions it, as all its rows share city coordinates.
+    """
+    dataset = LocationDataset()
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        for row in csv.DictReader(csv_file):
+            if not row[ZIP_COLUMN] or not row[CITY_COLUMN]:
+                continue
+
+            state_id = row[STATE_ID_COLUMN]
+            city_slug = slugify(row[CITY_SLUG_COLUMN])
+            dataset.states.setdefault(state_id, row[STATE_NAME_COLUMN])
+            if city_slug not in dataset.cities:
+                dataset.cities[city_slug] = (
+                    row[CITY_COLUMN],
+                    state_id,
+                    float(row[CITY_LONGITUDE_COLUMN]),
+                    float(row[CITY_LATITUDE_COLUMN]),
+                )
+            dataset.zip_codes[row[ZIP_COLUMN].zfill(5)] = (
+                city_slug,
+                float(row[ZIP_LONGITUDE_COLUMN]),
+                float(row[ZIP_LATITUDE_COLUMN]),
+            )
+    return dataset
+
+
+def _make_ewkt(longitude: float, latitude: float) -> str:
+    return f"SRID=4326;POINT({longitude} {latitude})"
+
+
+def _copy_upsert(
+    cursor, table: str, columns: t.Sequence[str], rows: t.Iterable[t.Sequence], conflict: str
+) -> int:
+    """
+    `COPY` rows into a temporary table and merge it into the target table.
+    Rows equal to the existing ones are not touched, so the returned number of
+    inserted or updated rows is what actually changed in the dataset.
+    """
+    quote = connection.ops.quote_name
+    staging = quote(f"{table}_staging")
+    column_list = ", ".join(quote(column) for column in columns)
+    update_columns = [quote(column) for column in columns if column != conflict]
+
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {quote(table)} WITH NO DATA"
+    )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    cursor.execute(
+        f"INSERT INTO {quote(table)} ({column_list}) SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT ({quote(conflict)}) DO UPDATE SET "
+        + ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+        + " WHERE ("
+        + ", ".join(f"{quote(table)}.{column}" for column in update_columns)
+        + ") IS DISTINCT FROM ("
+        + ", ".join(f"EXCLUDED.{column}" for column in update_columns)
+        + ")"
+    )
+    return cursor.rowcount
+
+
+def _update_seller_locations(cursor) -> int:
+    """
+    Copy moved zip code locations to the denormalized `ProductArticle.seller_location`
+    """
+    quote = connection.ops.quote_name
+    product_table = quote(apps.get_model("store.ProductArticle")._meta.db_table)
+    user_table = quote(get_user_model()._meta.db_table)
+    zip_code_table = quote(LocationZipCode._meta.db_table)
+    cursor.execute(
+        f"UPDATE {product_table} AS product "
+        f"SET seller_location = zip_code.location::geography "
+        f"FROM {user_table} AS seller "
+        f"JOIN {zip_code_table} AS zip_code ON zip_code.id = seller.zip_code_id "
+        f"WHERE product.seller_id = seller.id AND zip_code.location IS NOT NULL "
+        f"AND (product.seller_location IS NULL "
+        f"OR NOT ST_Equals(product.seller_location::geometry, zip_code.location))"
+    )
+    return cursor.rowcount
+
+
+def _upsert_states(
+    dataset: LocationDataset, country: LocationCountry
+) -> t.Tuple[t.Dict[str, int], int, int]:
+    existing = {state.name: state for state in LocationState.objects.filter(country=country)}
+
+    to_create, to_update = [], []
+    for state_id, full_name in dataset.states.items():
+        state = existing.get(state_id)
+        if state is None:
+            to_create.append(
+                LocationState(
+                    name=state_id, full_name=full_name, country=country, slug=slugify(state_id)
+                )
+            )
+        elif state.full_name != full_name:
+            state.full_name = full_name
+            to_update.append(state)
+
+    LocationState.objects.bulk_create(to_create)
+    LocationState.objects.bulk_update(to_update, fields=("full_name",))
+
+    state_ids = dict(
+        LocationState.objects.filter(country=country).values_list("name", "id").order_by()
+    )
+    return state_ids, len(to_create), len(to_update)
+
+
+@transaction.atomic
+def load_locations(path: str, country_name: str) -> LocationLoadResult:
+    """
+    Insert new and update changed states, cities and zip codes of the dataset.
+    Locations missing from the dataset are kept, as users and products refer to them.
+    """
+    dataset = read_location_dataset(path)
+    country = LocationCountry.objects.get(name=country_name)
+    state_ids, created_states, updated_states = _upsert_states(dataset, country)
+
+    with connection.cursor() as cursor:
+        upserted_cities = _copy_upsert(
+            cursor,
+            table=LocationCity._meta.db_table,
+            columns=("slug", "name", "state_id", "location", "lookup_key"),
+            rows=(
+                (
+                    slug,
+                    name,
+                    state_ids[state_id],
+                    _make_ewkt(longitude, latitude),
+                    LocationCity.make_lookup_key(name, state_id),
+                )
+                for slug, (name, state_id, longitude, latitude) in dataset.cities.items()
+            ),
+            conflict="slug",
+        )
+
+        city_ids = dict(LocationCity.objects.values_list("slug", "id").order_by())
+        upserted_zip_codes = _copy_upsert(
+            cursor,
+            table=LocationZipCode._meta.db_table,
+            columns=("slug", "name", "system_name", "city_id", "location"),
+            rows=(
+                (
+                    slugify(zip_code),
+                    zip_code,
+                    slugify(zip_code),
+                    city_ids[city_slug],
+                    _make_ewkt(longitude, latitude),
+                )
+                for zip_code, (city_slug, longitude, latitude) in dataset.zip_codes.items()
+            ),
+            conflict="slug",
+        )
+        moved_products = _update_seller_locations(cursor)
+
+    # Raw SQL doesn't send model signals
+    transaction.on_commit(lambda: invalidate_view_cache(*LOCATION_VIEW_CACHE_KEYS))
+    transaction.on_commit(invalidate_nearest_city_index)
+    if moved_products:
+        transaction.on_commit(bump_catalog_generation)
+    return LocationLoadResult(
+        created_states=created_states,
+        updated_states=updated_states,
+        upserted_cities=upserted_cities,
+        upserted_zip_codes=upserted_zip_codes,
+        moved_products=moved_products,
+    )
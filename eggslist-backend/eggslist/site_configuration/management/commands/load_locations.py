@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from eggslist.site_configuration.location_loader import load_locations
+
+
+class Command(BaseCommand):
+    help = "Load states, cities and zip codes from the geo dataset, updating only changed rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=settings.GEO_ZIP_PATH,
+            help="Path to `uszips_states.csv`",
+        )
+        parser.add_argument(
+            "--country",
+            default="United States",
+            help="Name of an existing `LocationCountry` the states belong to",
+        )
+
+    def handle(self, *args, **options):
+        result = load_locations(path=options["path"], country_name=options["country"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created_states} and updated {result.updated_states} states, "
+                f"upserted {result.upserted_cities} cities "
+                f"and {result.upserted_zip_codes} zip codes, "
+                f"moved {result.moved_products} products"
+            )
+        )
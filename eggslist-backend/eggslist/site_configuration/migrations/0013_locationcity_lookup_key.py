@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+FILL_LOOKUP_KEY_SQL = """
+UPDATE site_configuration_locationcity AS city
+SET lookup_key = LOWER(TRIM(city.name)) || '|' || LOWER(TRIM(state.name))
+FROM site_configuration_locationstate AS state
+WHERE state.id = city.state_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0012_alter_sitebranding_color_scheme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='locationcity',
+            name='lookup_key',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Lowercased `city|state` used to match geolocated city names', max_length=160, verbose_name='lookup key'),
+        ),
+        migrations.RunSQL(FILL_LOOKUP_KEY_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0013_locationcity_lookup_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='locationcity',
+            index=models.Index(fields=['lookup_key'], name='city_lookup_key_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='locationzipcode',
+            index=models.Index(fields=['name'], name='zip_code_name_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.17 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+# Keep the first city of every `city|state` key: move zip codes of the duplicates to it
+# and drop their popular product rankings, which are rebuilt by the next refresh
+DEDUPLICATE_CITIES_SQL = """
+CREATE TEMPORARY TABLE duplicate_city ON COMMIT DROP AS
+SELECT id, keep_id FROM (
+    SELECT id, MIN(id) OVER (PARTITION BY lookup_key) AS keep_id
+    FROM site_configuration_locationcity
+) AS city
+WHERE id <> keep_id;
+
+UPDATE site_configuration_locationzipcode AS zip_code
+SET city_id = duplicate_city.keep_id
+FROM duplicate_city
+WHERE zip_code.city_id = duplicate_city.id;
+
+DELETE FROM store_popularproductranking
+WHERE city_id IN (SELECT id FROM duplicate_city);
+
+DELETE FROM site_configuration_locationcity
+WHERE id IN (SELECT id FROM duplicate_city);
+
+-- Check deferred foreign keys now, the table can't be altered with pending trigger events
+SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0014_location_prefix_indexes'),
+        ('store', '0016_popularproductranking'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPLICATE_CITIES_SQL, migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name='locationcity',
+            name='lookup_key',
+            field=models.CharField(editable=False, help_text='Lowercased `city|state` used to match geolocated city names', max_length=160, unique=True, verbose_name='lookup key'),
+        ),
+    ]
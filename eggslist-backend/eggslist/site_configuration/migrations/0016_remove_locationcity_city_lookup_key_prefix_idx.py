@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 17:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0015_alter_locationcity_lookup_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='locationcity',
+            name='city_lookup_key_prefix_idx',
+        ),
+    ]
@@ -1,14 +1,20 @@
+import typing as t
+
 from django.contrib.gis.db import models as gis_models
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos.point import Point
 from django.core.cache import cache
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFill
 from solo.models import SingletonModel
 
+from eggslist.site_configuration.branding import BRANDING_SNAPSHOT_CACHE_KEY
 from eggslist.utils.models import NameSlugModel, _SlugModelMixin
+from eggslist.utils.view_cache import invalidate_view_cache
 
 
 class LocationStateManager(models.Manager):
@@ -20,11 +26,40 @@ class LocationCityManager(gis_models.Manager):
     def get_queryset(self):
         return super().get_queryset().select_related("state__country")
 
+    def get_by_name(self, city_name: str, state_name: str) -> "LocationCity":
+        return self.get(lookup_key=LocationCity.make_lookup_key(city_name, state_name))
+
+    def autocomplete(
+        self, prefix: str, point: t.Optional[Point], limit: int
+    ) -> t.List["LocationCity"]:
+        """
+        Cities whose name starts with the prefix, closest to the point first
+        """
+        qs = self.filter(lookup_key__startswith=prefix.strip().lower())
+        if point is None:
+            return list(qs.order_by("name")[:limit])
+        return list(
+            qs.annotate(distance=Distance("location", point)).order_by("distance", "name")[:limit]
+        )
+
 
 class LocationZipCodeManager(gis_models.Manager):
     def get_queryset(self):
         return super().get_queryset().select_related("city__state__country")
 
+    def autocomplete(
+        self, prefix: str, point: t.Optional[Point], limit: int
+    ) -> t.List["LocationZipCode"]:
+        """
+        Zip codes starting with the prefix, closest to the point first
+        """
+        qs = self.filter(name__startswith=prefix.strip())
+        if point is None:
+            return list(qs.order_by("name")[:limit])
+        return list(
+            qs.annotate(distance=Distance("location", point)).order_by("distance", "name")[:limit]
+        )
+
 
 class LocationCountry(NameSlugModel):
     class Meta:
@@ -57,6 +92,13 @@ class LocationCity(_SlugModelMixin, gis_models.Model):
         on_delete=models.CASCADE,
     )
     location = gis_models.PointField(verbose_name=_("location"), null=True, blank=True)
+    lookup_key = models.CharField(
+        verbose_name=_("lookup key"),
+        max_length=160,
+        unique=True,
+        editable=False,
+        help_text=_("Lowercased `city|state` used to match geolocated city names"),
+    )
     slug_field_name = "name"
     slug_field_unique = True
     objects = LocationCityManager()
@@ -68,6 +110,14 @@ class LocationCity(_SlugModelMixin, gis_models.Model):
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def make_lookup_key(city_name: str, state_name: str) -> str:
+        return f"{city_name.strip().lower()}|{state_name.strip().lower()}"
+
+    def save(self, *args, **kwargs):
+        self.lookup_key = self.make_lookup_key(self.name, self.state.name)
+        super().save(*args, **kwargs)
+
 
 class LocationZipCode(_SlugModelMixin, gis_models.Model):
     name = models.CharField(verbose_name=_("name"), max_length=64)
@@ -87,6 +137,13 @@ class LocationZipCode(_SlugModelMixin, gis_models.Model):
     class Meta:
         verbose_name = _("location zip code")
         verbose_name_plural = _("location zip codes")
+        indexes = (
+            models.Index(
+                fields=("name",),
+                name="zip_code_name_prefix_idx",
+                opclasses=("varchar_pattern_ops",),
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -300,3 +357,20 @@ BRANDING_CACHE_KEY = "site_branding_api"
 @receiver(post_save, sender=SiteBranding)
 def clear_branding_cache(sender, **kwargs):
     cache.delete(BRANDING_CACHE_KEY)
+    # Processes reload their branding snapshot once the new branding is committed
+    transaction.on_commit(lambda: invalidate_view_cache(BRANDING_SNAPSHOT_CACHE_KEY))
+
+
+LOCATION_VIEW_CACHE_KEYS = ("location_states", "location_cities", "location_zip_codes")
+
+
+@receiver(post_save, sender=LocationCountry)
+@receiver(post_save, sender=LocationState)
+@receiver(post_save, sender=LocationCity)
+@receiver(post_save, sender=LocationZipCode)
+@receiver(post_delete, sender=LocationCountry)
+@receiver(post_delete, sender=LocationState)
+@receiver(post_delete, sender=LocationCity)
+@receiver(post_delete, sender=LocationZipCode)
+def clear_location_cache(sender, **kwargs):
+    invalidate_view_cache(*LOCATION_VIEW_CACHE_KEYS)
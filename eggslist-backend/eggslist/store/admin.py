@@ -1,10 +1,12 @@
 from adminsortable2.admin import SortableAdminMixin
 from django.contrib import admin, messages
+from django.db import transaction
 from django.db.models import Count, DateTimeField, F, Max, Min, Sum, Value
 from django.db.models.functions import Trunc
 from django.utils.translation import ngettext
 
 from eggslist.store import models
+from eggslist.store.catalog_cache import bump_catalog_generation
 from eggslist.utils.admin import ImageAdmin
 
 
@@ -46,7 +48,8 @@ class ProductArticleAdmin(ImageAdmin):
     )
     list_display_images = ("image",)
     list_select_related = ("seller", "subcategory__category")
-    readonly_fields = ("engagement_count", "date_created", "slug")
+    readonly_fields = ("current_engagement_count", "date_created", "slug")
+    exclude = ("engagement_count", "seller_location", "search_vector")
     search_fields = (
         "id",
         "subcategory__name",
@@ -71,6 +74,7 @@ class ProductArticleAdmin(ImageAdmin):
 
     def mark_as_archived(self, request, queryset):
         updated = queryset.update(is_archived=True)
+        transaction.on_commit(bump_catalog_generation)
         self.message_user(
             request,
             ngettext(
@@ -84,6 +88,7 @@ class ProductArticleAdmin(ImageAdmin):
 
     def unmark_as_archived(self, request, queryset):
         updated = queryset.update(is_archived=False)
+        transaction.on_commit(bump_catalog_generation)
         self.message_user(
             request,
             ngettext(
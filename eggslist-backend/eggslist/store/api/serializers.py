@@ -1,11 +1,16 @@
 import typing as t
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Manager
 from rest_framework import serializers
 
 from eggslist.site_configuration.models import LocationZipCode
-from eggslist.store import article_create_rule, models
+from eggslist.store import article_create_rule, constants, models
 from eggslist.store.api import messages
+from eggslist.store.product_cards import ProductCardStorage
+from eggslist.users.user_location_storage import UserLocationStorage
+from eggslist.utils.request_metrics import measure
 
 User = get_user_model()
 
@@ -69,6 +74,84 @@ class ProductSerializerBase(serializers.ModelSerializer):
         return data
 
 
+class ProductCardSerializer(serializers.ModelSerializer):
+    """
+    Product part of a catalog card. It's serialized without a request,
+    so the image url is made absolute when the card is assembled.
+    """
+
+    slug = serializers.CharField(read_only=True)
+    price = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+    class Meta:
+        model = models.ProductArticle
+        fields = ("title", "image", "slug", "price", "is_out_of_stock")
+
+
+class ProductCardListSerializer(serializers.ListSerializer):
+    """
+    Assemble catalog cards from precomputed product and seller parts.
+    Only `id`, `seller_id` and `seller__is_favorite` are read from the products,
+    missing parts are built with a single query and stored for the next requests.
+    """
+
+    def to_representation(self, data) -> t.List[t.Dict]:
+        with measure("serializer"):
+            return self._to_cards(data)
+
+    def _to_cards(self, data) -> t.List[t.Dict]:
+        products = list(data.all() if isinstance(data, Manager) else data)
+        product_cards, seller_cards = ProductCardStorage.get_many(
+            product_ids=[product.id for product in products],
+            seller_ids={product.seller_id for product in products},
+        )
+
+        missing_ids = [
+            product.id
+            for product in products
+            if product.id not in product_cards or product.seller_id not in seller_cards
+        ]
+        if missing_ids:
+            new_product_cards, new_seller_cards = {}, {}
+            for product in models.ProductArticle.objects.filter(id__in=missing_ids).select_related(
+                "seller"
+            ):
+                new_product_cards[product.id] = dict(ProductCardSerializer(product).data)
+                new_seller_cards[product.seller_id] = dict(
+                    SellerSerializerSmall(product.seller).data
+                )
+            ProductCardStorage.set_many(products=new_product_cards, sellers=new_seller_cards)
+            product_cards.update(new_product_cards)
+            seller_cards.update(new_seller_cards)
+
+        request = self.context.get("request")
+        return [
+            self._assemble_card(
+                product, product_cards[product.id], seller_cards[product.seller_id], request
+            )
+            for product in products
+            if product.id in product_cards
+        ]
+
+    def _assemble_card(self, product, product_card: t.Dict, seller_card: t.Dict, request):
+        seller = dict(seller_card)
+        if hasattr(product, "seller__is_favorite"):
+            seller["is_favorite"] = product.seller__is_favorite
+
+        image = product_card["image"]
+        if image is not None and request is not None:
+            image = request.build_absolute_uri(image)
+
+        return {
+            "title": product_card["title"],
+            "image": image,
+            "slug": product_card["slug"],
+            "price": product_card["price"],
+            "seller": seller,
+            "is_out_of_stock": product_card["is_out_of_stock"],
+        }
+
+
 class ProductArticleSerializerSmall(ProductSerializerBase):
     slug = serializers.CharField(read_only=True)
     price = serializers.DecimalField(max_digits=8, decimal_places=2)
@@ -77,6 +160,7 @@ class ProductArticleSerializerSmall(ProductSerializerBase):
     class Meta:
         model = models.ProductArticle
         fields = ("title", "image", "slug", "price", "seller", "is_out_of_stock")
+        list_serializer_class = ProductCardListSerializer
 
 
 class ProductArticleSerializerSmallMy(ProductSerializerBase):
@@ -123,19 +207,55 @@ class ProductArticleSerializer(ProductSerializerBase):
         )
         model = models.ProductArticle
 
+    def _get_user_location(self) -> t.Tuple:
+        if "user_location" not in self.context:
+            self.context["user_location"] = UserLocationStorage.get_user_location(
+                user_id=self.context["user_id"]
+            )
+        return self.context["user_location"]
+
+    def _get_recommendations(self, obj) -> t.Dict[str, t.List]:
+        """
+        Fetch both recommendation rails at once. Anonymous users get the same
+        recommendations for the same location, so they are cached.
+        """
+        if not hasattr(self, "_recommendations"):
+            self._recommendations = {}
+        if obj.id in self._recommendations:
+            return self._recommendations[obj.id]
+
+        request = self.context["request"]
+        user = request.user
+        city, lookup_radius, is_undefined = self._get_user_location()
+        cache_key = None
+        if not user.is_authenticated:
+            cache_key = constants.RECOMMENDATIONS_CACHE_KEY.format(
+                product_id=obj.id,
+                city_id=getattr(city, "id", None),
+                lookup_radius=lookup_radius,
+            )
+            recommendations = cache.get(cache_key)
+            if recommendations is not None:
+                self._recommendations[obj.id] = recommendations
+                return recommendations
+
+        similar, same_farm = models.ProductArticle.objects.get_recommendations_for(
+            obj, user=user, city=city, lookup_radius=lookup_radius
+        )
+        recommendations = {
+            "you_may_also_like": ProductArticleSerializerSmall(similar, many=True).data,
+            "more_from_this_farm": ProductArticleSerializerSmall(same_farm, many=True).data,
+        }
+        if cache_key is not None:
+            cache.set(cache_key, recommendations, timeout=constants.RECOMMENDATIONS_CACHE_TIMEOUT)
+        self._recommendations[obj.id] = recommendations
+        return recommendations
+
     def get_you_may_also_like(self, obj):
-        user = self.context["request"].user
-        user_id = self.context["user_id"]
-        qs = models.ProductArticle.objects.get_best_similar_for(obj, user=user, user_id=user_id)
-        return ProductArticleSerializerSmall(qs, many=True).data
+        return self._get_recommendations(obj)["you_may_also_like"]
 
     def get_more_from_this_farm(self, obj):
-        user = self.context["request"].user
-        user_id = self.context["user_id"]
-        qs = models.ProductArticle.objects.get_from_the_same_farm_for(
-            obj, user=user, user_id=user_id
-        )
-        return ProductArticleSerializerSmall(qs, many=True).data
+        return self._get_recommendations(obj)["more_from_this_farm"]
 
     def create(self, validated_data):
         try:
@@ -180,6 +300,107 @@ class SellerTransactionListSerializer(TransactionListSerializer):
         )
 
 
+class TransactionValuesSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path for transaction lists. Serializes `.values(*values_fields)`
+    rows into the same output as the ModelSerializer in `model_serializer_class`
+    without model instances and field introspection.
+    """
+
+    model_serializer_class: t.Type[TransactionListSerializer]
+    values_fields: t.Tuple[str, ...] = ()
+
+    _price_field = serializers.DecimalField(max_digits=8, decimal_places=2)
+    _datetime_field = serializers.DateTimeField()
+    _status_labels = dict(models.Transaction.Status.choices)
+
+    def to_representation(self, row: t.Dict) -> t.Dict:
+        return {
+            field_name: getattr(self, f"get_{field_name}")(row)
+            for field_name in self.model_serializer_class.Meta.fields
+        }
+
+    def _get_file_url(self, model, field_name: str, name: t.Optional[str]) -> t.Optional[str]:
+        if not name:
+            return None
+        url = model._meta.get_field(field_name).storage.url(name)
+        request = self.context.get("request")
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_product(self, row: t.Dict) -> t.Optional[t.Dict]:
+        if row["product_id"] is None:
+            return None
+        return {
+            "title": row["product__title"],
+            "image": self._get_file_url(models.ProductArticle, "image", row["product__image"]),
+            "slug": row["product__slug"],
+            "price": self._price_field.to_representation(row["product__price"]),
+        }
+
+    def get_price(self, row: t.Dict) -> str:
+        return self._price_field.to_representation(row["price"])
+
+    def get_application_fee(self, row: t.Dict) -> str:
+        return "{0:.2f}".format(row["application_fee"] / 100)
+
+    def get_created_at(self, row: t.Dict) -> str:
+        return self._datetime_field.to_representation(row["created_at"])
+
+    def get_status(self, row: t.Dict) -> str:
+        return str(self._status_labels.get(row["status"], row["status"]))
+
+    def get_customer(self, row: t.Dict) -> t.Optional[int]:
+        return row["customer_id"]
+
+    def get_customer_email(self, row: t.Dict) -> t.Optional[str]:
+        return row["customer_email"]
+
+    def get_seller(self, row: t.Dict) -> t.Dict:
+        location = None
+        if row["seller__zip_code_id"] is not None:
+            location = {
+                "zipcode": row["seller__zip_code__name"],
+                "city": row["seller__zip_code__city__name"],
+                "state": row["seller__zip_code__city__state__name"],
+            }
+        phone_number = row["seller__phone_number"]
+        return {
+            "id": row["seller_id"],
+            "first_name": row["seller__first_name"],
+            "last_name": row["seller__last_name"],
+            "avatar": self._get_file_url(User, "avatar", row["seller__avatar"]),
+            "phone_number": str(phone_number) if phone_number is not None else None,
+            "email": row["seller__email"],
+            "is_verified_seller": row["seller__is_verified_seller"],
+            "is_stripe_connected": row["seller__stripe_connection__is_onboarding_completed"],
+            "location": location,
+        }
+
+
+_TRANSACTION_PRODUCT_VALUES = (
+    "product_id",
+    "product__title",
+    "product__image",
+    "product__slug",
+    "product__price",
+)
+
+
+class SellerTransactionListValuesSerializer(TransactionValuesSerializer):
+    model_serializer_class = SellerTransactionListSerializer
+    values_fields = (
+        *_TRANSACTION_PRODUCT_VALUES,
+        "price",
+        "application_fee",
+        "created_at",
+        "status",
+        "customer_id",
+        "customer_email",
+    )
+
+
 class SellerTransactionListTotalSalesSerializer(serializers.Serializer):
     total_sales = serializers.DecimalField(max_digits=20, decimal_places=2, default=0)
     transaction_list = serializers.DictField(allow_empty=True)
@@ -194,3 +415,25 @@ class CustomerTransactionListSerializer(TransactionListSerializer):
     class Meta:
         model = models.Transaction
         fields = ("product", "price", "created_at", "status", "seller")
+
+
+class CustomerTransactionListValuesSerializer(TransactionValuesSerializer):
+    model_serializer_class = CustomerTransactionListSerializer
+    values_fields = (
+        *_TRANSACTION_PRODUCT_VALUES,
+        "price",
+        "created_at",
+        "status",
+        "seller_id",
+        "seller__first_name",
+        "seller__last_name",
+        "seller__avatar",
+        "seller__phone_number",
+        "seller__email",
+        "seller__is_verified_seller",
+        "seller__stripe_connection__is_onboarding_completed",
+        "seller__zip_code_id",
+        "seller__zip_code__name",
+        "seller__zip_code__city__name",
+        "seller__zip_code__city__state__name",
+    )
@@ -1,10 +1,11 @@
 import typing as t
 
 from django.conf import settings
+from django.contrib.gis.measure import D
 from django.db.models import DecimalField, ExpressionWrapper, Sum, Value
 from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions
+from rest_framework import generics, permissions
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -12,11 +13,17 @@ from rest_framework.views import APIView
 
 from eggslist.store import models
 from eggslist.store.api import messages, serializers
-from eggslist.store.filters import ProductFilter
+from eggslist.store.catalog_cache import get_catalog_generation
+from eggslist.store.filters import ProductFilter, ProductFullTextSearchFilter
 from eggslist.users.permissions import IsVerifiedSeller
+from eggslist.users.user_location_storage import UserLocationStorage
 from eggslist.utils.stripe import api as stripe_api
-from eggslist.utils.views.mixins import AnonymousUserIdAPIMixin
-from eggslist.utils.views.pagination import PageNumberPaginationWithCount
+from eggslist.utils.views.mixins import (
+    AnonymousResponseCacheAPIMixin,
+    AnonymousUserIdAPIMixin,
+    KeysetPaginationAPIMixin,
+)
+from eggslist.utils.views.pagination import KeysetPagination, PageNumberPaginationWithCount
 
 
 class CategoryListAPIView(generics.ListAPIView):
@@ -31,19 +38,64 @@ class ProductCatalogPagination(PageNumberPaginationWithCount):
     page_size = 12
 
 
-class ProductArticleListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
+class ProductCatalogKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination aware of the `distance` annotation used by `proximity` ordering
+    """
+
+    page_size = 12
+
+    def encode_value(self, field_name: str, value):
+        if field_name == "distance":
+            return value.m
+        return super().encode_value(field_name, value)
+
+    def decode_value(self, field_name: str, value):
+        if field_name == "distance":
+            return D(m=value)
+        return super().decode_value(field_name, value)
+
+
+class PopularProductKeysetPagination(ProductCatalogKeysetPagination):
+    page_size = 8
+
+
+class CatalogResponseCacheAPIMixin(AnonymousResponseCacheAPIMixin):
+    """
+    Anonymous catalog responses depend only on user location and query parameters
+    """
+
+    def get_response_cache_generation(self) -> int:
+        return get_catalog_generation()
+
+    def get_response_cache_vary(self) -> t.Tuple:
+        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(
+            user_id=self.get_user_id()
+        )
+        return getattr(city, "id", None), lookup_radius
+
+
+class ProductArticleListAPIView(
+    CatalogResponseCacheAPIMixin,
+    KeysetPaginationAPIMixin,
+    AnonymousUserIdAPIMixin,
+    generics.ListAPIView,
+):
     """
     Get Product Articles. Use filters as query parameters.
     Find query parameters information below.
     API method returns the query already filtered according to user location
-    if it is provided in Cookie Session
+    if it is provided in Cookie Session.
+    Pass `pagination=cursor` to get cursor pages (follow `next` links) and
+    `with_count=false` to skip counting the total number of products.
     """
 
     serializer_class = serializers.ProductArticleSerializerSmall
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filter_backends = (DjangoFilterBackend, ProductFullTextSearchFilter)
     filterset_class = ProductFilter
-    search_fields = ("title", "description")
     pagination_class = ProductCatalogPagination
+    keyset_pagination_class = ProductCatalogKeysetPagination
+    response_cache_key = "catalog"
 
     def get_queryset(self):
         return models.ProductArticle.objects.get_all_catalog_no_hidden(
@@ -51,18 +103,31 @@ class ProductArticleListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
         )
 
 
-class PopularProductListAPIView(AnonymousUserIdAPIMixin, generics.ListAPIView):
+class PopularProductListAPIView(
+    CatalogResponseCacheAPIMixin,
+    KeysetPaginationAPIMixin,
+    AnonymousUserIdAPIMixin,
+    generics.ListAPIView,
+):
     """
-    Get Popular products near the user
+    Get Popular products near the user from the rankings rebuilt by
+    `refresh_popular_products`.
+    Pass `pagination=cursor` to page through all of the popular products by 8.
     """
 
     serializer_class = serializers.ProductArticleSerializerSmall
     pagination_class = ProductCatalogPagination
+    keyset_pagination_class = PopularProductKeysetPagination
+    response_cache_key = "popular"
 
     def get_queryset(self):
-        return models.ProductArticle.objects.get_all_catalog_no_hidden(
+        if self.is_keyset_paginated:
+            return models.ProductArticle.objects.get_all_catalog_no_hidden(
+                user=self.request.user, user_id=self.get_user_id()
+            )
+        return models.ProductArticle.objects.get_popular_for(
             user=self.request.user, user_id=self.get_user_id()
-        )[:8]
+        )
 
 
 class ProfileProductPagination(PageNumberPaginationWithCount):
@@ -134,7 +199,11 @@ class ProductArticleCreateAPIView(AnonymousUserIdAPIMixin, generics.CreateAPIVie
         context = super().get_serializer_context()
 
         if hasattr(self.request, "user"):
-            context.update(user_id=self.get_user_id())
+            user_id = self.get_user_id()
+            context.update(
+                user_id=user_id,
+                user_location=UserLocationStorage.get_user_location(user_id=user_id),
+            )
         return context
 
 
@@ -157,7 +226,11 @@ class ProductArticleDetailAPIView(AnonymousUserIdAPIMixin, generics.RetrieveUpda
         context = super().get_serializer_context()
 
         if hasattr(self.request, "user"):
-            context.update(user_id=self.get_user_id())
+            user_id = self.get_user_id()
+            context.update(
+                user_id=user_id,
+                user_location=UserLocationStorage.get_user_location(user_id=user_id),
+            )
         return context
 
     def get_object(self):
@@ -248,7 +321,7 @@ class CreateTransactionAPIView(APIView):
 
 class SellerTransactionsListAPIView(generics.GenericAPIView):
     permissions = (IsVerifiedSeller,)
-    serializer_class = serializers.SellerTransactionListSerializer
+    serializer_class = serializers.SellerTransactionListValuesSerializer
     response_serializer_class = serializers.SellerTransactionListTotalSalesSerializer
     pagination_class = PageNumberPaginationWithCount
     pagination_class.page_size = 20
@@ -259,8 +332,8 @@ class SellerTransactionsListAPIView(generics.GenericAPIView):
     def get_queryset(self):
         return (
             models.Transaction.objects.filter(seller=self.request.user)
-            .prefetch_related("product")
             .order_by("-modified_at")
+            .values(*self.serializer_class.values_fields)
         )
 
     def get_total_sales_queryset(self):
@@ -292,25 +365,25 @@ class SellerTransactionsListAPIView(generics.GenericAPIView):
 
 
 class SellerRecentTransactionListAPIView(generics.ListAPIView):
-    serializer_class = serializers.SellerTransactionListSerializer
+    serializer_class = serializers.SellerTransactionListValuesSerializer
     permission_classes = (IsVerifiedSeller,)
 
     def get_queryset(self):
         return (
             models.Transaction.objects.filter(seller=self.request.user)
-            .prefetch_related("product")
             .order_by("-modified_at")
+            .values(*self.serializer_class.values_fields)
         )[:3]
 
 
 class CustomerTransactionListAPIView(generics.ListAPIView):
-    serializer_class = serializers.CustomerTransactionListSerializer
+    serializer_class = serializers.CustomerTransactionListValuesSerializer
     pagination_class = PageNumberPaginationWithCount
     pagination_class.page_size = 20
 
     def get_queryset(self):
         return (
             models.Transaction.objects.filter(customer=self.request.user)
-            .prefetch_related("seller", "product")
             .order_by("-modified_at")
+            .values(*self.serializer_class.values_fields)
         )
@@ -9,3 +9,7 @@ class StoreAppsConfig(AppConfig):
 
     def ready(self):
         import eggslist.store.article_create_rule  # noqa
+        import eggslist.store.signals.catalog_cache  # noqa
+        import eggslist.store.signals.product_card  # noqa
+        import eggslist.store.signals.search_vector  # noqa
+        import eggslist.store.signals.seller_location  # noqa
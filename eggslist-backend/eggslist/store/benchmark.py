@@ -0,0 +1,199 @@
+import math
+import statistics
+import time
+import typing as t
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from eggslist.store import models
+from eggslist.store.catalog_cache import bump_catalog_generation
+from eggslist.store.seed import SeededCatalog
+from eggslist.users.user_location_storage import UserLocationStorage
+
+
+@dataclass
+class Scenario:
+    name: str
+    url: str
+    user: t.Any = None
+    # Anonymous catalog responses are cached, drop the cache before every request
+    bypass_catalog_cache: bool = False
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_queries: float
+    max_queries: int
+    mean_bytes: float
+    status_codes: t.List[int] = field(default_factory=list)
+
+
+def _percentile(values: t.List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return round(ordered[index], 2)
+
+
+def _with_query(url: str, **params) -> str:
+    return f"{url}?{urlencode(params)}"
+
+
+def get_scenarios(catalog: SeededCatalog) -> t.List[Scenario]:
+    customer, seller = catalog.customer, catalog.sellers[0]
+    product = models.ProductArticle.objects.filter(
+        seller__in=catalog.sellers, is_hidden=False, is_archived=False
+    ).first()
+    product_list_url = reverse("eggslist:store:product-list")
+
+    scenarios = [
+        Scenario("catalog", product_list_url, bypass_catalog_cache=True),
+        Scenario(
+            "catalog by price",
+            _with_query(product_list_url, ordering="price"),
+            bypass_catalog_cache=True,
+        ),
+        Scenario(
+            "catalog cursor",
+            _with_query(product_list_url, pagination="cursor", with_count="false"),
+            bypass_catalog_cache=True,
+        ),
+        Scenario("catalog authenticated", product_list_url, user=customer),
+        Scenario(
+            "search",
+            _with_query(product_list_url, search="seeded product"),
+            bypass_catalog_cache=True,
+        ),
+        Scenario("popular", reverse("eggslist:store:product-popular"), bypass_catalog_cache=True),
+        Scenario(
+            "recently viewed", reverse("eggslist:store:product-recently-viewed"), user=customer
+        ),
+        Scenario(
+            "other user products",
+            reverse("eggslist:store:other-user-product", kwargs={"seller_id": seller.id}),
+        ),
+        Scenario(
+            "seller transactions", reverse("eggslist:store:seller-transactions"), user=seller
+        ),
+        Scenario(
+            "customer transactions", reverse("eggslist:store:customer-transactions"), user=customer
+        ),
+        Scenario("user location", reverse("eggslist:users:locate")),
+    ]
+    if product is not None:
+        scenarios.append(
+            Scenario(
+                "product detail",
+                reverse("eggslist:store:product-detail", kwargs={"slug": product.slug}),
+            )
+        )
+    if catalog.city is not None:
+        scenarios.extend(
+            (
+                Scenario(
+                    "location autocomplete",
+                    _with_query(
+                        reverse("eggslist:site_configuration:location-autocomplete"),
+                        q=catalog.city.name[:3],
+                    ),
+                ),
+                Scenario(
+                    "locate by coordinates",
+                    _with_query(
+                        reverse("eggslist:users:locate-by-coordinates"),
+                        latitude=catalog.city.location.y,
+                        longitude=catalog.city.location.x,
+                    ),
+                ),
+            )
+        )
+    return scenarios
+
+
+def make_client(catalog: SeededCatalog, host: str, location_id: str) -> Client:
+    """
+    Client of an anonymous visitor located in the seeded city
+    """
+    client = Client(SERVER_NAME=host)
+    if catalog.city is not None:
+        UserLocationStorage.set_user_location(
+            user_id=location_id,
+            city_location=catalog.city,
+            lookup_radius=settings.DEFAULT_LOOKUP_RADIUS,
+            is_undefined=False,
+        )
+        client.cookies[settings.USER_LOCATION_COOKIE_NAME] = location_id
+    return client
+
+
+def run_scenario(
+    client: Client, scenario: Scenario, iterations: int, warmup: int
+) -> ScenarioResult:
+    headers = {}
+    if scenario.user is not None:
+        access_token = RefreshToken.for_user(scenario.user).access_token
+        headers["HTTP_AUTHORIZATION"] = f"Bearer {access_token}"
+
+    for _ in range(warmup):
+        client.get(scenario.url, **headers)
+
+    latencies, query_counts, sizes, status_codes = [], [], [], set()
+    for _ in range(iterations):
+        if scenario.bypass_catalog_cache:
+            bump_catalog_generation()
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            response = client.get(scenario.url, **headers)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+        query_counts.append(len(queries))
+        sizes.append(len(response.content))
+        status_codes.add(response.status_code)
+
+    return ScenarioResult(
+        name=scenario.name,
+        p50_ms=_percentile(latencies, 50),
+        p95_ms=_percentile(latencies, 95),
+        p99_ms=_percentile(latencies, 99),
+        mean_queries=round(statistics.mean(query_counts), 2),
+        max_queries=max(query_counts),
+        mean_bytes=round(statistics.mean(sizes), 2),
+        status_codes=sorted(status_codes),
+    )
+
+
+def compare_with_baseline(
+    results: t.List[ScenarioResult], baseline: t.Dict[str, t.Dict], max_regression: float
+) -> t.List[str]:
+    """
+    Return descriptions of scenarios which got slower than `max_regression` (a fraction
+    of the baseline p95) or started to make more queries than in the baseline
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        if result.p95_ms > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{result.name}: p95 {result.p95_ms}ms, baseline {previous['p95_ms']}ms"
+            )
+        if result.max_queries > previous["max_queries"]:
+            regressions.append(
+                f"{result.name}: {result.max_queries} queries, "
+                f"baseline {previous['max_queries']}"
+            )
+    return regressions
+
+
+def results_to_dict(results: t.List[ScenarioResult]) -> t.Dict[str, t.Dict]:
+    return {result.name: asdict(result) for result in results}
@@ -0,0 +1,15 @@
+from eggslist.utils.view_cache import get_view_cache_generation, invalidate_view_cache
+
+_CATALOG_CACHE_KEY = "catalog"
+
+
+def get_catalog_generation() -> int:
+    return get_view_cache_generation(_CATALOG_CACHE_KEY)
+
+
+def bump_catalog_generation():
+    """
+    Invalidate all of the cached catalog responses at once: cache keys include
+    the generation, so old entries are never read again and just expire
+    """
+    invalidate_view_cache(_CATALOG_CACHE_KEY)
@@ -1,6 +1,24 @@
 CATEGORY_CACHE_KEY = "categories"
 SUBCATEGORY_CACHE_KEY = "subcategories"
+RECOMMENDATIONS_CACHE_KEY = "product_recommendations::{product_id}::{city_id}::{lookup_radius}"
+RECOMMENDATIONS_CACHE_TIMEOUT = 60 * 5
+PRODUCT_CARD_CACHE_TIMEOUT = 60 * 60 * 24
 
 DELIVERY = "delivery"
 PICKUP = "pick_up"
 DELIVERY_OPTIONS = ((DELIVERY, "delivery"), (PICKUP, "pick up"))
+
+PRODUCT_SEARCH_CONFIG = "english"
+
+RECENTLY_VIEWED_LIMIT_PER_USER = 24
+
+# `You may also like` picks the best of the most engaging products within the lookup radius
+SIMILAR_PRODUCTS_CANDIDATES_LIMIT = 32
+SIMILAR_PRODUCTS_PROXIMITY_WEIGHT = 0.5
+
+# `Popular near you` rankings are stored per city for these lookup radiuses (in miles).
+# A user radius uses the largest bucket not exceeding it.
+POPULAR_PRODUCTS_RADIUS_BUCKETS = (5, 10, 20, 50, 100, 250, 500)
+POPULAR_PRODUCTS_LIMIT = 8
+# Score of a product halves when it gets this old
+POPULAR_PRODUCTS_RECENCY_HALF_LIFE_DAYS = 30
@@ -0,0 +1,112 @@
+import typing as t
+
+from django.db import DatabaseError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from redis.exceptions import LockError, ResponseError
+
+from eggslist.store.catalog_cache import bump_catalog_generation
+from eggslist.utils.redis_client import get_redis_client
+
+
+class EngagementCounter:
+    """
+    Buffer `Contact` button clicks in a Redis hash (slug -> clicks) instead of
+    updating `ProductArticle.engagement_count` on every click. Buffered clicks are
+    written to the database in bulk with `flush`
+    (`manage.py flush_engagement_counts`).
+    """
+
+    _PENDING_KEY = "engagement_count::pending"
+    _FLUSHING_KEY = "engagement_count::flushing"
+    _LOCK_KEY = "engagement_count::flush_lock"
+    flush_batch_size = 500
+    flush_lock_timeout = 5 * 60
+
+    @classmethod
+    def increase(cls, slug: str):
+        get_redis_client().hincrby(cls._PENDING_KEY, slug, 1)
+
+    @classmethod
+    def get_pending(cls, slugs: t.Iterable[str]) -> t.Dict[str, int]:
+        slugs = list(slugs)
+        if not slugs:
+            return {}
+        client = get_redis_client()
+        pending, flushing = client.hmget(cls._PENDING_KEY, slugs), client.hmget(
+            cls._FLUSHING_KEY, slugs
+        )
+        return {
+            slug: int(pending_count or 0) + int(flushing_count or 0)
+            for slug, pending_count, flushing_count in zip(slugs, pending, flushing)
+        }
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Move buffered clicks to the database. Returns the number of updated products.
+        A batch left by an interrupted flush is written before the new one is taken.
+        Concurrent flushes (cron next to `--interval`, several workers) are skipped.
+        """
+        client = get_redis_client()
+        lock = client.lock(cls._LOCK_KEY, timeout=cls.flush_lock_timeout)
+        if not lock.acquire(blocking=False):
+            return 0
+        try:
+            updated = cls._flush_batch(client)
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # The lock has expired
+                pass
+
+        if updated:
+            # Relevance ordering has changed
+            bump_catalog_generation()
+        return updated
+
+    @classmethod
+    def _flush_batch(cls, client) -> int:
+        if not client.exists(cls._FLUSHING_KEY):
+            try:
+                client.rename(cls._PENDING_KEY, cls._FLUSHING_KEY)
+            except ResponseError:
+                # Nothing is buffered
+                return 0
+
+        counts = {
+            slug.decode("utf-8"): int(count)
+            for slug, count in client.hgetall(cls._FLUSHING_KEY).items()
+        }
+        try:
+            return cls._write_counts(client, counts)
+        except DatabaseError:
+            if not client.exists(cls._FLUSHING_KEY):
+                # The batch was dropped but the transaction wasn't committed, buffer it again
+                pipeline = client.pipeline()
+                for slug, count in counts.items():
+                    pipeline.hincrby(cls._PENDING_KEY, slug, count)
+                pipeline.execute()
+            raise
+
+    @classmethod
+    def _write_counts(cls, client, counts: t.Dict[str, int]) -> int:
+        from eggslist.store.models import ProductArticle
+
+        updated = 0
+        slugs = list(counts)
+        with transaction.atomic():
+            for start in range(0, len(slugs), cls.flush_batch_size):
+                batch = slugs[start : start + cls.flush_batch_size]
+                increment = Case(
+                    *(When(slug=slug, then=Value(counts[slug])) for slug in batch),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                updated += ProductArticle.objects.filter(slug__in=batch).update(
+                    engagement_count=F("engagement_count") + increment
+                )
+            # Drop the batch as the last step of the transaction, so a crash after
+            # the commit can't apply it twice
+            client.delete(cls._FLUSHING_KEY)
+        return updated
@@ -1,10 +1,16 @@
+import re
+
 import django_filters as filters
 from django import forms
 from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
 from django.db.utils import DatabaseError
+from rest_framework.filters import SearchFilter
 
 from eggslist.site_configuration.models import LocationZipCode
 from eggslist.store import models
+from eggslist.store.constants import PRODUCT_SEARCH_CONFIG
 
 if settings.DEBUG:
     try:
@@ -74,3 +80,34 @@ class ProductFilter(filters.FilterSet):
     class Meta:
         model = models.ProductArticle
         fields = ("subcategory", "allow_pickup", "allow_delivery")
+
+
+class ProductFullTextSearchFilter(SearchFilter):
+    """
+    Full-text search over `ProductArticle.search_vector` with prefix matching of each term.
+    Results are ranked by relevance to the search terms unless the client asked
+    for an explicit `ordering`.
+    """
+
+    search_vector_field = "search_vector"
+    ordering_param = "ordering"
+    _term_re = re.compile(r"\w+", re.UNICODE)
+
+    def get_search_query(self, request):
+        terms = self._term_re.findall(" ".join(self.get_search_terms(request)))
+        if not terms:
+            return None
+        raw_query = " & ".join(f"{term}:*" for term in terms)
+        return SearchQuery(raw_query, search_type="raw", config=PRODUCT_SEARCH_CONFIG)
+
+    def filter_queryset(self, request, queryset, view):
+        search_query = self.get_search_query(request)
+        if search_query is None:
+            return queryset
+
+        queryset = queryset.filter(**{self.search_vector_field: search_query}).annotate(
+            search_rank=SearchRank(F(self.search_vector_field), search_query)
+        )
+        if request.query_params.get(self.ordering_param):
+            return queryset
+        return queryset.order_by("-search_rank")
@@ -0,0 +1,80 @@
+import json
+import secrets
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from eggslist.store.benchmark import (
+    compare_with_baseline,
+    get_scenarios,
+    make_client,
+    results_to_dict,
+    run_scenario,
+)
+from eggslist.store.seed import seed_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic catalog in a rolled back transaction and measure latency "
+        "percentiles, query counts and response sizes of the store, users and location APIs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10000, help="Products to seed")
+        parser.add_argument("--sellers", type=int, default=200, help="Sellers to seed")
+        parser.add_argument("--transactions", type=int, default=2000, help="Transactions to seed")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed of the dataset")
+        parser.add_argument("--iterations", type=int, default=50, help="Requests per scenario")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests first")
+        parser.add_argument("--host", default="localhost", help="Host header of the requests")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument(
+            "--baseline", help="Compare results with a JSON file written with `--output`"
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed p95 growth over the baseline as a fraction",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            catalog = seed_catalog(
+                products=options["products"],
+                sellers=options["sellers"],
+                transactions=options["transactions"],
+                random_seed=options["seed"],
+            )
+            client = make_client(
+                catalog, host=options["host"], location_id=f"benchmark-{secrets.token_hex(6)}"
+            )
+            results = []
+            for scenario in get_scenarios(catalog):
+                result = run_scenario(
+                    client, scenario, iterations=options["iterations"], warmup=options["warmup"]
+                )
+                results.append(result)
+                self.stdout.write(
+                    f"{result.name:<24} p50 {result.p50_ms:>8}ms  p95 {result.p95_ms:>8}ms  "
+                    f"p99 {result.p99_ms:>8}ms  queries {result.mean_queries:>6}  "
+                    f"bytes {result.mean_bytes:>10}  status {result.status_codes}"
+                )
+
+            transaction.set_rollback(True)
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                json.dump(results_to_dict(results), output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_with_baseline(
+                results, baseline, max_regression=options["max_regression"]
+            )
+            if regressions:
+                raise CommandError("Regressions:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
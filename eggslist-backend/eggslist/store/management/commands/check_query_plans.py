@@ -0,0 +1,168 @@
+import json
+import secrets
+import typing as t
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from eggslist.store import models
+from eggslist.store.constants import POPULAR_PRODUCTS_LIMIT
+from eggslist.store.popular_products import get_radius_bucket
+from eggslist.store.seed import SeededCatalog, seed_catalog
+from eggslist.users.user_location_storage import UserLocationStorage
+
+CHECKED_TABLES = {
+    models.ProductArticle._meta.db_table,
+    models.UserViewTimestamp._meta.db_table,
+    models.Transaction._meta.db_table,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic catalog in a rolled back transaction, EXPLAIN the store "
+        "manager queries against it and fail if any of them scans a store table sequentially"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=20000, help="Products to seed")
+        parser.add_argument("--sellers", type=int, default=200, help="Sellers to seed")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed of the dataset")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            catalog = seed_catalog(
+                products=options["products"],
+                sellers=options["sellers"],
+                random_seed=options["seed"],
+            )
+            location_id = f"check-query-plans-{secrets.token_hex(8)}"
+            if catalog.city is not None:
+                UserLocationStorage.set_user_location(
+                    user_id=location_id,
+                    city_location=catalog.city,
+                    lookup_radius=settings.DEFAULT_LOOKUP_RADIUS,
+                    is_undefined=False,
+                )
+                self.seed_popular_ranking(catalog)
+            with connection.cursor() as cursor:
+                for table in CHECKED_TABLES:
+                    cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+            failed = []
+            for name, check in self.get_checks(catalog, location_id=location_id):
+                seq_scans = self.get_seq_scans(check)
+                if seq_scans:
+                    failed.append(name)
+                    self.stdout.write(
+                        self.style.ERROR(f"{name}: sequential scan on {', '.join(seq_scans)}")
+                    )
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: OK"))
+
+            transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f"Sequential scans in: {', '.join(failed)}")
+
+    def seed_popular_ranking(self, catalog: SeededCatalog):
+        """
+        Ranking of the seeded city, so `get_popular_for` reads the ranking
+        instead of falling back to the catalog query
+        """
+        radius_bucket = get_radius_bucket(settings.DEFAULT_LOOKUP_RADIUS)
+        if radius_bucket is None:
+            return
+        product_ids = models.ProductArticle.objects.filter(
+            seller__in=catalog.sellers, is_hidden=False, is_archived=False
+        ).values_list("id", flat=True)[:POPULAR_PRODUCTS_LIMIT]
+        models.PopularProductRanking.objects.bulk_create(
+            models.PopularProductRanking(
+                city=catalog.city,
+                radius_bucket=radius_bucket,
+                product_id=product_id,
+                rank=rank,
+                score=POPULAR_PRODUCTS_LIMIT - rank,
+            )
+            for rank, product_id in enumerate(product_ids)
+        )
+
+    def get_checks(
+        self, catalog: SeededCatalog, location_id: str
+    ) -> t.List[t.Tuple[str, t.Callable[[], t.Any]]]:
+        """
+        Manager calls made the way the API views make them, with the customer
+        located in the seeded city. Every query they run is EXPLAINed.
+        """
+        manager = models.ProductArticle.objects
+        anonymous = AnonymousUser()
+        customer, seller = catalog.customer, catalog.sellers[0]
+        city, lookup_radius, _ = UserLocationStorage.get_user_location(user_id=location_id)
+        product = manager.filter(
+            seller__in=catalog.sellers, is_hidden=False, is_archived=False
+        ).first()
+
+        transactions = models.Transaction.objects.order_by("-modified_at")
+
+        def get_catalog():
+            return manager.get_all_catalog_no_hidden(user=customer, user_id=location_id)
+
+        checks = [
+            ("get_all_catalog_no_hidden", lambda: list(get_catalog()[:12])),
+            (
+                "get_all_catalog_no_hidden by price",
+                lambda: list(get_catalog().order_by("price", "id")[:12]),
+            ),
+            (
+                "get_all_catalog_no_hidden by date",
+                lambda: list(get_catalog().order_by("-date_created", "id")[:12]),
+            ),
+            ("get_for", lambda: list(manager.get_for(seller)[:8])),
+            ("get_hidden_for", lambda: list(manager.get_hidden_for(user=seller)[:8])),
+            (
+                "get_for_other",
+                lambda: list(manager.get_for_other(user=anonymous, other_user_id=seller.id)[:8]),
+            ),
+            ("get_recently_viewed_for", lambda: list(manager.get_recently_viewed_for(customer))),
+            (
+                "get_popular_for",
+                lambda: manager.get_popular_for(user=customer, user_id=location_id),
+            ),
+            ("seller transactions", lambda: list(transactions.filter(seller=seller)[:20])),
+            ("customer transactions", lambda: list(transactions.filter(customer=customer)[:20])),
+        ]
+        if product is not None:
+            checks.append(
+                (
+                    "get_recommendations_for",
+                    lambda: manager.get_recommendations_for(
+                        product, user=customer, city=city, lookup_radius=lookup_radius
+                    ),
+                )
+            )
+        return checks
+
+    def get_seq_scans(self, check: t.Callable[[], t.Any]) -> t.List[str]:
+        with CaptureQueriesContext(connection) as queries:
+            check()
+
+        seq_scans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if not query["sql"].lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {query['sql']}")
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                nodes = [plan[0]["Plan"]]
+                while nodes:
+                    node = nodes.pop()
+                    relation = node.get("Relation Name")
+                    if node["Node Type"] == "Seq Scan" and relation in CHECKED_TABLES:
+                        seq_scans.append(relation)
+                    nodes.extend(node.get("Plans", ()))
+        return sorted(set(seq_scans))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eggslist.store.engagement_counter import EngagementCounter
+
+
+class Command(BaseCommand):
+    help = "Write `Contact` button clicks buffered in Redis to product engagement counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running and flush every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            updated = EngagementCounter.flush()
+            self.stdout.write(
+                self.style.SUCCESS(f"Updated engagement count of {updated} products")
+            )
+            if interval is None:
+                return
+            time.sleep(interval)
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from eggslist.store.recently_viewed import RecentlyViewedBuffer
+
+
+class Command(BaseCommand):
+    help = "Write product views buffered in Redis to users' recently viewed lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running and flush every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            try:
+                written = RecentlyViewedBuffer.flush()
+            except DatabaseError as error:
+                if interval is None:
+                    raise
+                # Failed views are buffered again, retry on the next run
+                self.stderr.write(self.style.ERROR(f"Failed to write product views: {error!r}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Written {written} product views"))
+                if interval is None:
+                    return
+            time.sleep(interval)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eggslist.store.popular_products import refresh_rankings
+
+
+class Command(BaseCommand):
+    help = "Rebuild `Popular near you` product rankings per city and lookup radius"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running and refresh every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            refreshed = refresh_rankings()
+            self.stdout.write(
+                self.style.SUCCESS(f"Refreshed {refreshed} popular product rankings")
+            )
+            if interval is None:
+                return
+            time.sleep(interval)
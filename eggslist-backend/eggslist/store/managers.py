@@ -1,18 +1,77 @@
+import typing as t
+
+from django.apps import apps
 from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos.point import Point
 from django.contrib.gis.measure import D
-from django.db.models import Exists, F, Manager, OuterRef, Q, QuerySet, Value
+from django.contrib.postgres.search import SearchVector
+from django.db.models import (
+    BooleanField,
+    Case,
+    Exists,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Manager,
+    OuterRef,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
+from redis.exceptions import RedisError
 
+from eggslist.store.constants import (
+    POPULAR_PRODUCTS_LIMIT,
+    PRODUCT_SEARCH_CONFIG,
+    RECENTLY_VIEWED_LIMIT_PER_USER,
+    SIMILAR_PRODUCTS_CANDIDATES_LIMIT,
+    SIMILAR_PRODUCTS_PROXIMITY_WEIGHT,
+)
+from eggslist.store.engagement_counter import EngagementCounter
+from eggslist.store.popular_products import get_radius_bucket, is_empty_ranking, mark_requested
+from eggslist.store.recently_viewed import RecentlyViewedBuffer
 from eggslist.users.models import UserFavoriteFarm
 from eggslist.users.user_location_storage import UserLocationStorage
 
+# Catalog cards are precomputed, list querysets load only ordering and pagination fields
+CATALOG_CARD_QUERY_FIELDS = ("id", "seller", "price", "date_created", "engagement_count")
+
+
+def get_search_vector() -> SearchVector:
+    """
+    Weighted `search_vector` of a product computed from its own columns
+    """
+    return SearchVector("title", weight="A", config=PRODUCT_SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=PRODUCT_SEARCH_CONFIG
+    )
+
 
 class ProductArticlManager(Manager):
+    def update_seller_location(self, seller):
+        """
+        Copy seller's zip code location to all of the seller's products
+        """
+        location = seller.zip_code.location if seller.zip_code_id is not None else None
+        return self.filter(seller_id=seller.id).update(seller_location=location)
+
+    def update_search_vector(self, product_id: int):
+        return self.filter(id=product_id).update(search_vector=get_search_vector())
+
     def increase_engagement_count(self, slug: str):
-        updted_number = self.filter(slug=slug).update(engagement_count=F("engagement_count") + 1)
-        if updted_number == 0:
+        """
+        Buffer a click in Redis. Buffered clicks are written to the database
+        by `flush_engagement_counts` management command.
+        """
+        if not self.filter(slug=slug).exists():
             raise self.model.DoesNotExist()
 
+        try:
+            EngagementCounter.increase(slug)
+        except RedisError:
+            # Don't lose the click if the buffer is not available
+            self.filter(slug=slug).update(engagement_count=F("engagement_count") + 1)
+
     def _annotate_with_favorites(self, qs, user):
         """
         Annotate a queryset with seller__is_favorite parameter. Use only with user.
@@ -31,13 +90,51 @@ class ProductArticlManager(Manager):
             # This is to be consistent and always have distance measured.
             # In this case all items will have 0 distance.
             return qs.annotate(distance=Distance(Point(0, 0, srid=4326), Point(0, 0, srid=4326)))
-        return qs.annotate(distance=Distance("seller__zip_code__location", city.location))
+        return qs.annotate(distance=Distance("seller_location", city.location))
+
+    def _filter_within_radius(self, qs, city, lookup_radius) -> QuerySet:
+        """
+        Filter a queryset by the lookup radius using the GiST index on `seller_location`.
+        If city is not defined all the items are considered to be close enough.
+        """
+        if city is None:
+            return qs
+        return qs.filter(seller_location__dwithin=(city.location, D(mi=int(lookup_radius))))
+
+    def _get_recently_viewed_ids(self, user) -> t.List[int]:
+        """
+        Merge views stored in the database with views which are still buffered
+        """
+        UserViewTimestamp = apps.get_model("store.UserViewTimestamp")
+        viewed = dict(
+            UserViewTimestamp.objects.filter(user=user)
+            .order_by("-timestamp")
+            .values_list("product_id", "timestamp")[:RECENTLY_VIEWED_LIMIT_PER_USER]
+        )
+        try:
+            pending = RecentlyViewedBuffer.get_pending(user_id=user.id)
+        except RedisError:
+            pending = {}
+
+        for product_id, timestamp in pending.items():
+            if product_id not in viewed or viewed[product_id] < timestamp:
+                viewed[product_id] = timestamp
+        return sorted(viewed, key=viewed.get, reverse=True)
 
     def get_recently_viewed_for(self, user):
-        qs = self.filter(user_view_timestamps__user=user, is_hidden=False, is_archived=False)
-        return self._annotate_with_favorites(qs, user).order_by(
-            "-user_view_timestamps__timestamp"
-        )[:8]
+        product_ids = self._get_recently_viewed_ids(user)
+        if not product_ids:
+            return self.none()
+
+        qs = self.filter(id__in=product_ids, is_hidden=False, is_archived=False)
+        view_order = Case(
+            *(
+                When(id=product_id, then=Value(index))
+                for index, product_id in enumerate(product_ids)
+            ),
+            output_field=IntegerField(),
+        )
+        return self._annotate_with_favorites(qs, user).order_by(view_order)[:8]
 
     def get_for(self, user):
         return self.filter(seller=user, is_hidden=False, is_archived=False).select_related(
@@ -47,11 +144,8 @@ class ProductArticlManager(Manager):
         )
 
     def get_for_other(self, user, other_user_id):
-        qs = self.filter(
-            seller_id=other_user_id, is_hidden=False, is_archived=False
-        ).select_related(
-            "subcategory",
-            "seller__stripe_connection",
+        qs = self.filter(seller_id=other_user_id, is_hidden=False, is_archived=False).only(
+            *CATALOG_CARD_QUERY_FIELDS
         )
         return self._annotate_with_favorites(qs, user=user)
 
@@ -62,42 +156,117 @@ class ProductArticlManager(Manager):
             "seller__stripe_connection",
         )
 
-    def get_best_similar_for(self, instance, user, user_id) -> QuerySet:
-        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
+    def _rank_similar(self, candidates: t.List, lookup_radius, limit: int) -> t.List:
+        """
+        Order candidates by a blend of engagement (relative to the most engaging
+        candidate) and proximity (relative to the lookup radius)
+        """
+        if not candidates:
+            return []
+
+        max_engagement = max(product.engagement_count for product in candidates) or 1
+        radius_m = D(mi=int(lookup_radius)).m if lookup_radius else 0
+
+        def score(product) -> float:
+            engagement = product.engagement_count / max_engagement
+            proximity = 0.0
+            if radius_m and product.distance is not None:
+                proximity = max(0.0, 1 - product.distance.m / radius_m)
+            weight = SIMILAR_PRODUCTS_PROXIMITY_WEIGHT
+            return (1 - weight) * engagement + weight * proximity
+
+        return sorted(candidates, key=score, reverse=True)[:limit]
+
+    def get_recommendations_for(
+        self, instance, user, city, lookup_radius, limit: int = 4
+    ) -> t.Tuple[t.List, t.List]:
+        """
+        Return `you may also like` and `more from this farm` products fetched with
+        a single query. Similar products are the same subcategory products within the
+        lookup radius: the radius filter uses the GiST index on `seller_location`,
+        only the most engaging candidates get distance computed and the best of them
+        are picked by engagement and proximity.
+        """
+        similar_ids = (
+            self._filter_within_radius(
+                self.filter(
+                    ~Q(slug=instance.slug),
+                    subcategory_id=instance.subcategory_id,
+                    is_hidden=False,
+                    is_archived=False,
+                ),
+                city=city,
+                lookup_radius=lookup_radius,
+            )
+            .order_by("-engagement_count")
+            .values("id")[:SIMILAR_PRODUCTS_CANDIDATES_LIMIT]
         )
-        qs = self._annotate_with_distance(qs, city)
-        qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
+        same_farm_ids = self.filter(
             ~Q(slug=instance.slug),
-            subcategory=instance.subcategory,
+            seller_id=instance.seller_id,
             is_hidden=False,
             is_archived=False,
-            distance__lte=D(mi=lookup_radius),
-        )[:4]
+        ).values("id")[:limit]
 
-    def get_from_the_same_farm_for(self, instance, user, user_id) -> QuerySet:
-        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
+        qs = (
+            self.filter(Q(id__in=similar_ids) | Q(id__in=same_farm_ids))
+            .only(*CATALOG_CARD_QUERY_FIELDS)
+            .annotate(
+                is_similar=ExpressionWrapper(Q(id__in=similar_ids), output_field=BooleanField()),
+                is_same_farm=ExpressionWrapper(
+                    Q(id__in=same_farm_ids), output_field=BooleanField()
+                ),
+            )
+        )
+        qs = self._annotate_with_distance(qs, city=city)
+        products = list(self._annotate_with_favorites(qs, user=user))
+        return (
+            self._rank_similar(
+                [product for product in products if product.is_similar],
+                lookup_radius=lookup_radius,
+                limit=limit,
+            ),
+            [product for product in products if product.is_same_farm],
         )
-        qs = self._annotate_with_distance(qs, city)
-        qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
-            ~Q(slug=instance.slug), is_hidden=False, is_archived=False, seller=instance.seller
-        )[:4]
 
     def get_all_catalog_no_hidden(self, user, user_id) -> QuerySet:
+        """
+        Products are serialized from precomputed cards, so only the fields
+        used for ordering and pagination are loaded
+        """
         city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
-        qs = self.select_related(
-            "seller__zip_code__city__state", "seller__stripe_connection", "subcategory"
-        )
+        qs = self.only(*CATALOG_CARD_QUERY_FIELDS)
+        qs = self._filter_within_radius(qs, city=city, lookup_radius=lookup_radius)
         qs = self._annotate_with_distance(qs, city=city)
         qs = self._annotate_with_favorites(qs, user=user)
-        return qs.filter(
-            is_hidden=False, is_archived=False, distance__lte=D(mi=int(lookup_radius))
-        )
+        return qs.filter(is_hidden=False, is_archived=False)
+
+    def get_popular_for(self, user, user_id) -> t.List:
+        """
+        Read popular products near the user from the precomputed ranking.
+        If the ranking is not built yet, fall back to the catalog query
+        and ask the next `refresh_popular_products` run to build it.
+        A ranking built without products stays empty until the next refresh.
+        """
+        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(user_id=user_id)
+        radius_bucket = get_radius_bucket(lookup_radius)
+        if city is not None and radius_bucket is not None:
+            qs = (
+                self.filter(
+                    popular_rankings__city_id=city.id,
+                    popular_rankings__radius_bucket=radius_bucket,
+                    is_hidden=False,
+                    is_archived=False,
+                )
+                .only(*CATALOG_CARD_QUERY_FIELDS)
+                .order_by("popular_rankings__rank")
+            )
+            products = list(self._annotate_with_favorites(qs, user=user)[:POPULAR_PRODUCTS_LIMIT])
+            if products or is_empty_ranking(city_id=city.id, radius_bucket=radius_bucket):
+                return products
+            mark_requested(city_id=city.id, radius_bucket=radius_bucket)
+
+        return list(self.get_all_catalog_no_hidden(user, user_id)[:POPULAR_PRODUCTS_LIMIT])
 
     def get_all_catalog_with_hidden(self, user, user_id):
         qs = self.filter(is_archived=False).select_related(
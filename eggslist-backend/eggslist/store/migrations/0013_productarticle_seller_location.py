@@ -0,0 +1,30 @@
+# Generated by Django 4.2.17 on 2026-10-18 10:12
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+FILL_SELLER_LOCATION_SQL = """
+UPDATE store_productarticle AS product
+SET seller_location = zip_code.location::geography
+FROM users_user AS seller
+JOIN site_configuration_locationzipcode AS zip_code ON zip_code.id = seller.zip_code_id
+WHERE seller.id = product.seller_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0012_alter_sitebranding_color_scheme'),
+        ('users', '0010_userstripeconnection'),
+        ('store', '0012_alter_transaction_product'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productarticle',
+            name='seller_location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, help_text="Copy of the seller's zip code location used for catalog radius lookups", null=True, srid=4326, verbose_name='seller location'),
+        ),
+        migrations.RunSQL(FILL_SELLER_LOCATION_SQL, migrations.RunSQL.noop),
+    ]
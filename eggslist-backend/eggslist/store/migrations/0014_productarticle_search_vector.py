@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-18 11:03
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+FILL_SEARCH_VECTOR_SQL = """
+UPDATE store_productarticle
+SET search_vector = (
+    setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A')
+    || setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0013_productarticle_seller_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productarticle',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True, verbose_name='search vector'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+        ),
+        migrations.RunSQL(FILL_SEARCH_VECTOR_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.17 on 2026-10-18 11:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0014_productarticle_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userviewtimestamp',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='timestamp'),
+        ),
+    ]
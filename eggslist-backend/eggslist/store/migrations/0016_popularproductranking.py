@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_configuration', '0014_location_prefix_indexes'),
+        ('store', '0015_alter_userviewtimestamp_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularProductRanking',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('radius_bucket', models.PositiveIntegerField(help_text='Lookup radius in miles', verbose_name='radius bucket')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='rank')),
+                ('score', models.FloatField(verbose_name='score')),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='refreshed at')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='popular_product_rankings', to='site_configuration.locationcity', verbose_name='city')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='popular_rankings', to='store.productarticle', verbose_name='product')),
+            ],
+            options={
+                'verbose_name': 'popular product ranking',
+                'verbose_name_plural': 'popular product rankings',
+                'ordering': ('rank',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='popularproductranking',
+            constraint=models.UniqueConstraint(fields=('city', 'radius_bucket', 'rank'), name='popular_product_ranking_unique_rank'),
+        ),
+    ]
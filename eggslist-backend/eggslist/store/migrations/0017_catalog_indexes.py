@@ -0,0 +1,46 @@
+# Generated by Django 4.2.17 on 2026-10-18 16:02
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0016_popularproductranking'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=models.Index(django.db.models.expressions.OrderBy(django.db.models.expressions.F('engagement_count'), descending=True), models.F('id'), condition=models.Q(('is_archived', False), ('is_hidden', False)), name='product_visible_engagement_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=models.Index(models.F('price'), models.F('id'), condition=models.Q(('is_archived', False), ('is_hidden', False)), name='product_visible_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=models.Index(django.db.models.expressions.OrderBy(django.db.models.expressions.F('date_created'), descending=True), models.F('id'), condition=models.Q(('is_archived', False), ('is_hidden', False)), name='product_visible_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=models.Index(models.F('subcategory'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('engagement_count'), descending=True), condition=models.Q(('is_archived', False), ('is_hidden', False)), name='product_visible_subcat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productarticle',
+            index=models.Index(models.F('seller'), models.F('is_hidden'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('engagement_count'), descending=True), condition=models.Q(('is_archived', False)), name='product_seller_hidden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userviewtimestamp',
+            index=models.Index(models.F('user'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('timestamp'), descending=True), name='user_view_timestamp_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(models.F('seller'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('modified_at'), descending=True), name='transaction_seller_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(models.F('customer'), django.db.models.expressions.OrderBy(django.db.models.expressions.F('modified_at'), descending=True), name='transaction_customer_idx'),
+        ),
+    ]
@@ -1,13 +1,22 @@
 from django.conf import settings
+from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, Q
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFill
+from redis.exceptions import RedisError
 
+from eggslist.store.engagement_counter import EngagementCounter
 from eggslist.store.managers import ProductArticlManager
+from eggslist.store.recently_viewed import RecentlyViewedBuffer
 from eggslist.utils.models import NameSlugModel, TitleSlugModel
 
+VISIBLE_PRODUCT_CONDITION = Q(is_hidden=False, is_archived=False)
+
 
 class Category(NameSlugModel):
     image = ProcessedImageField(
@@ -78,21 +87,87 @@ class ProductArticle(TitleSlugModel):
         default=False,
         help_text=_("Whether or not the item is shown in the store"),
     )
+    seller_location = gis_models.PointField(
+        verbose_name=_("seller location"),
+        help_text=_("Copy of the seller's zip code location used for catalog radius lookups"),
+        geography=True,
+        null=True,
+        blank=True,
+    )
+    search_vector = SearchVectorField(verbose_name=_("search vector"), null=True, blank=True)
     objects = ProductArticlManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded seller to detect seller changes on save
+        instance._loaded_seller_id = instance.__dict__.get("seller_id")
+        return instance
+
+    @property
+    def is_seller_changed(self) -> bool:
+        return getattr(self, "_loaded_seller_id", None) != self.seller_id
+
     class Meta:
         verbose_name = _("product article")
         verbose_name_plural = _("product articles")
         ordering = ("-engagement_count",)
+        indexes = (
+            GinIndex(fields=("search_vector",), name="product_search_vector_idx"),
+            # Visible catalog (`is_hidden=False, is_archived=False`) in every catalog ordering
+            models.Index(
+                F("engagement_count").desc(),
+                "id",
+                name="product_visible_engagement_idx",
+                condition=VISIBLE_PRODUCT_CONDITION,
+            ),
+            models.Index(
+                "price",
+                "id",
+                name="product_visible_price_idx",
+                condition=VISIBLE_PRODUCT_CONDITION,
+            ),
+            models.Index(
+                F("date_created").desc(),
+                "id",
+                name="product_visible_date_idx",
+                condition=VISIBLE_PRODUCT_CONDITION,
+            ),
+            # Similar products rail
+            models.Index(
+                "subcategory",
+                F("engagement_count").desc(),
+                name="product_visible_subcat_idx",
+                condition=VISIBLE_PRODUCT_CONDITION,
+            ),
+            # Seller's own, hidden and other user's products
+            models.Index(
+                "seller",
+                "is_hidden",
+                F("engagement_count").desc(),
+                name="product_seller_hidden_idx",
+                condition=Q(is_archived=False),
+            ),
+        )
+
+    @property
+    def current_engagement_count(self) -> int:
+        """
+        Engagement count including clicks which are not flushed to the database yet
+        """
+        return self.engagement_count + EngagementCounter.get_pending([self.slug])[self.slug]
 
     def user_viewed(self, user):
-        UserViewTimestamp.objects.update_or_create(
-            user=user, product=self, defaults={"timestamp": now()}
-        )
+        try:
+            RecentlyViewedBuffer.add(user_id=user.id, product_id=self.id)
+        except RedisError:
+            UserViewTimestamp.objects.update_or_create(
+                user=user, product=self, defaults={"timestamp": now()}
+            )
 
 
 class UserViewTimestamp(models.Model):
-    timestamp = models.DateTimeField(verbose_name=_("timestamp"), auto_now=True)
+    timestamp = models.DateTimeField(verbose_name=_("timestamp"), default=now)
     user = models.ForeignKey(
         verbose_name=_("user"),
         to=settings.AUTH_USER_MODEL,
@@ -114,6 +189,46 @@ class UserViewTimestamp(models.Model):
                 fields=("user", "product"), name="user_product_unique_constraint"
             ),
         )
+        indexes = (
+            models.Index("user", F("timestamp").desc(), name="user_view_timestamp_user_idx"),
+        )
+
+
+class PopularProductRanking(models.Model):
+    """
+    Top products near a city within a lookup radius bucket.
+    Rebuilt by `refresh_popular_products` management command.
+    """
+
+    city = models.ForeignKey(
+        verbose_name=_("city"),
+        to="site_configuration.LocationCity",
+        on_delete=models.CASCADE,
+        related_name="popular_product_rankings",
+    )
+    radius_bucket = models.PositiveIntegerField(
+        verbose_name=_("radius bucket"), help_text=_("Lookup radius in miles")
+    )
+    product = models.ForeignKey(
+        verbose_name=_("product"),
+        to="ProductArticle",
+        on_delete=models.CASCADE,
+        related_name="popular_rankings",
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name=_("rank"))
+    score = models.FloatField(verbose_name=_("score"))
+    refreshed_at = models.DateTimeField(verbose_name=_("refreshed at"), default=now)
+
+    class Meta:
+        verbose_name = _("popular product ranking")
+        verbose_name_plural = _("popular product rankings")
+        ordering = ("rank",)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("city", "radius_bucket", "rank"),
+                name="popular_product_ranking_unique_rank",
+            ),
+        )
 
 
 class Transaction(models.Model):
@@ -162,6 +277,12 @@ class Transaction(models.Model):
     )
     customer_email = models.CharField(max_length=256, verbose_name=_("customer_email"), null=True)
 
+    class Meta:
+        indexes = (
+            models.Index("seller", F("modified_at").desc(), name="transaction_seller_idx"),
+            models.Index("customer", F("modified_at").desc(), name="transaction_customer_idx"),
+        )
+
 
 class SaleStatistic(Transaction):
     class Meta:
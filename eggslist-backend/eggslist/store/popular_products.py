@@ -0,0 +1,159 @@
+import bisect
+import typing as t
+
+from django.apps import apps
+from django.contrib.gis.measure import D
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import Cast, Extract, Now, Power
+from django.utils.timezone import now
+from redis.exceptions import RedisError
+
+from eggslist.store.constants import (
+    POPULAR_PRODUCTS_LIMIT,
+    POPULAR_PRODUCTS_RADIUS_BUCKETS,
+    POPULAR_PRODUCTS_RECENCY_HALF_LIFE_DAYS,
+)
+from eggslist.utils.redis_client import get_redis_client
+
+_REQUESTED_KEY = "popular_products::requested"
+_EMPTY_KEY = "popular_products::empty"
+_SECONDS_IN_DAY = 60 * 60 * 24
+
+
+def get_radius_bucket(lookup_radius: t.Optional[int]) -> t.Optional[int]:
+    """
+    Largest bucket not exceeding the lookup radius, so ranked products are
+    always within the radius chosen by the user
+    """
+    if not lookup_radius:
+        return None
+    index = bisect.bisect_right(POPULAR_PRODUCTS_RADIUS_BUCKETS, int(lookup_radius))
+    if index == 0:
+        return None
+    return POPULAR_PRODUCTS_RADIUS_BUCKETS[index - 1]
+
+
+def mark_requested(city_id: int, radius_bucket: int):
+    """
+    Ask the next refresh to build the ranking which was not found
+    """
+    try:
+        get_redis_client().sadd(_REQUESTED_KEY, f"{city_id}:{radius_bucket}")
+    except RedisError:
+        pass
+
+
+def is_empty_ranking(city_id: int, radius_bucket: int) -> bool:
+    """
+    Whether the last refresh found no products for the ranking,
+    as opposed to the ranking not being built yet
+    """
+    try:
+        return bool(get_redis_client().sismember(_EMPTY_KEY, f"{city_id}:{radius_bucket}"))
+    except RedisError:
+        return False
+
+
+def _parse_targets(members: t.Iterable[bytes]) -> t.Set[t.Tuple[int, int]]:
+    targets = set()
+    for target in members:
+        city_id, radius_bucket = target.decode().split(":")
+        targets.add((int(city_id), int(radius_bucket)))
+    return targets
+
+
+def _pop_requested() -> t.Set[t.Tuple[int, int]]:
+    pipeline = get_redis_client().pipeline(transaction=True)
+    pipeline.smembers(_REQUESTED_KEY)
+    pipeline.delete(_REQUESTED_KEY)
+    requested, _ = pipeline.execute()
+    return _parse_targets(requested)
+
+
+def _set_empty(targets: t.Set[t.Tuple[int, int]]):
+    pipeline = get_redis_client().pipeline(transaction=True)
+    pipeline.delete(_EMPTY_KEY)
+    if targets:
+        pipeline.sadd(
+            _EMPTY_KEY, *(f"{city_id}:{radius_bucket}" for city_id, radius_bucket in targets)
+        )
+    pipeline.execute()
+
+
+def _get_popularity_score() -> ExpressionWrapper:
+    """
+    Engagement count decayed by the product age
+    """
+    age_days = Extract(
+        ExpressionWrapper(Now() - F("date_created"), output_field=DurationField()), "epoch"
+    ) / Value(_SECONDS_IN_DAY)
+    return ExpressionWrapper(
+        Cast("engagement_count", FloatField())
+        / Power(Value(2.0), age_days / Value(POPULAR_PRODUCTS_RECENCY_HALF_LIFE_DAYS)),
+        output_field=FloatField(),
+    )
+
+
+def _build_ranking(city, radius_bucket: int) -> t.List[t.Tuple[int, float]]:
+    ProductArticle = apps.get_model("store.ProductArticle")
+    return list(
+        ProductArticle.objects.filter(
+            is_hidden=False,
+            is_archived=False,
+            seller_location__dwithin=(city.location, D(mi=radius_bucket)),
+        )
+        .annotate(score=_get_popularity_score())
+        .order_by("-score", "id")
+        .values_list("id", "score")[:POPULAR_PRODUCTS_LIMIT]
+    )
+
+
+def refresh_rankings() -> int:
+    """
+    Rebuild every stored ranking and the rankings requested since the last refresh.
+    Rankings without products have no rows, they are remembered in Redis instead
+    so reads can tell them from the rankings which are not built yet.
+    """
+    PopularProductRanking = apps.get_model("store.PopularProductRanking")
+    LocationCity = apps.get_model("site_configuration.LocationCity")
+
+    targets = set(
+        PopularProductRanking.objects.order_by().values_list("city_id", "radius_bucket").distinct()
+    )
+    try:
+        targets |= _parse_targets(get_redis_client().smembers(_EMPTY_KEY))
+        targets |= _pop_requested()
+    except RedisError:
+        pass
+
+    cities = LocationCity.objects.filter(
+        id__in={city_id for city_id, _ in targets}, location__isnull=False
+    ).in_bulk()
+    refreshed_at = now()
+    empty_targets = set()
+    for city_id, radius_bucket in targets:
+        city = cities.get(city_id)
+        ranking = _build_ranking(city, radius_bucket) if city is not None else []
+        if not ranking and city is not None:
+            empty_targets.add((city_id, radius_bucket))
+        with transaction.atomic():
+            PopularProductRanking.objects.filter(
+                city_id=city_id, radius_bucket=radius_bucket
+            ).delete()
+            PopularProductRanking.objects.bulk_create(
+                PopularProductRanking(
+                    city_id=city_id,
+                    radius_bucket=radius_bucket,
+                    product_id=product_id,
+                    rank=rank,
+                    score=score,
+                    refreshed_at=refreshed_at,
+                )
+                for rank, (product_id, score) in enumerate(ranking)
+            )
+    try:
+        _set_empty(empty_targets)
+    except RedisError:
+        pass
+    return len(targets)
@@ -0,0 +1,58 @@
+import typing as t
+
+from django.core.cache import cache
+
+from eggslist.store.constants import PRODUCT_CARD_CACHE_TIMEOUT
+
+_PRODUCT_CARD_KEY = "product_card::product::{product_id}"
+_SELLER_CARD_KEY = "product_card::seller::{seller_id}"
+
+
+class ProductCardStorage:
+    """
+    Precomputed catalog card parts. A card is assembled from a product part and
+    a seller part, so a seller change invalidates a single key instead of
+    the cards of all of the seller's products.
+    """
+
+    @classmethod
+    def get_many(
+        cls, product_ids: t.Iterable[int], seller_ids: t.Iterable[int]
+    ) -> t.Tuple[t.Dict[int, t.Dict], t.Dict[int, t.Dict]]:
+        product_keys = {cls._product_key(product_id): product_id for product_id in product_ids}
+        seller_keys = {cls._seller_key(seller_id): seller_id for seller_id in seller_ids}
+        cached = cache.get_many([*product_keys, *seller_keys])
+        return (
+            {product_keys[key]: cached[key] for key in product_keys if key in cached},
+            {seller_keys[key]: cached[key] for key in seller_keys if key in cached},
+        )
+
+    @classmethod
+    def set_many(cls, products: t.Dict[int, t.Dict], sellers: t.Dict[int, t.Dict]):
+        cache.set_many(
+            {
+                **{cls._product_key(product_id): card for product_id, card in products.items()},
+                **{cls._seller_key(seller_id): card for seller_id, card in sellers.items()},
+            },
+            timeout=PRODUCT_CARD_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate_product(cls, product_id: int):
+        cache.delete(cls._product_key(product_id))
+
+    @classmethod
+    def invalidate_seller(cls, seller_id: int):
+        cache.delete(cls._seller_key(seller_id))
+
+    @classmethod
+    def invalidate_sellers(cls, seller_ids: t.Iterable[int]):
+        cache.delete_many([cls._seller_key(seller_id) for seller_id in seller_ids])
+
+    @staticmethod
+    def _product_key(product_id: int) -> str:
+        return _PRODUCT_CARD_KEY.format(product_id=product_id)
+
+    @staticmethod
+    def _seller_key(seller_id: int) -> str:
+        return _SELLER_CARD_KEY.format(seller_id=seller_id)
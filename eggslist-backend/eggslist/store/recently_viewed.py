@@ -0,0 +1,146 @@
+import time
+import typing as t
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from eggslist.store.constants import RECENTLY_VIEWED_LIMIT_PER_USER
+from eggslist.utils.redis_client import get_redis_client
+
+
+class RecentlyViewedBuffer:
+    """
+    Buffer product views in Redis (a hash product_id -> timestamp per user) instead of
+    upserting `UserViewTimestamp` inside of the request. Buffered views are written to the
+    database in bulk with `flush` (`manage.py flush_recently_viewed`).
+    """
+
+    _PENDING_KEY = "recently_viewed::pending::user_id::{user_id}"
+    _PENDING_USERS_KEY = "recently_viewed::pending_users"
+    flush_batch_size = 500
+
+    @classmethod
+    def _get_pending_key(cls, user_id: int) -> str:
+        return cls._PENDING_KEY.format(user_id=user_id)
+
+    @classmethod
+    def add(cls, user_id: int, product_id: int):
+        pipeline = get_redis_client().pipeline()
+        pipeline.hset(cls._get_pending_key(user_id), product_id, time.time())
+        pipeline.sadd(cls._PENDING_USERS_KEY, user_id)
+        pipeline.execute()
+
+    @classmethod
+    def get_pending(cls, user_id: int) -> t.Dict[int, datetime]:
+        pending = get_redis_client().hgetall(cls._get_pending_key(user_id))
+        return {
+            int(product_id): datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+            for product_id, timestamp in pending.items()
+        }
+
+    @classmethod
+    def _pop_pending(cls, user_ids: t.List[int]) -> t.Dict[int, t.Dict[int, datetime]]:
+        pipeline = get_redis_client().pipeline(transaction=True)
+        for user_id in user_ids:
+            pipeline.hgetall(cls._get_pending_key(user_id))
+        pipeline.delete(*(cls._get_pending_key(user_id) for user_id in user_ids))
+        *pending_by_user, _ = pipeline.execute()
+        return {
+            user_id: {
+                int(product_id): datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+                for product_id, timestamp in pending.items()
+            }
+            for user_id, pending in zip(user_ids, pending_by_user)
+        }
+
+    @classmethod
+    def _buffer_again(cls, pending_by_user: t.Dict[int, t.Dict[int, datetime]]):
+        """
+        Put popped views back, views buffered since then are newer and are kept
+        """
+        pipeline = get_redis_client().pipeline()
+        for user_id, pending in pending_by_user.items():
+            for product_id, timestamp in pending.items():
+                pipeline.hsetnx(cls._get_pending_key(user_id), product_id, timestamp.timestamp())
+        if pending_by_user:
+            pipeline.sadd(cls._PENDING_USERS_KEY, *pending_by_user)
+        pipeline.execute()
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Upsert buffered views to the database and keep only
+        `RECENTLY_VIEWED_LIMIT_PER_USER` latest views for each user.
+        Returns the number of written views. Views of a batch which failed
+        to be written are buffered again.
+        """
+        client = get_redis_client()
+        written = 0
+        while True:
+            user_ids = [
+                int(user_id)
+                for user_id in client.spop(cls._PENDING_USERS_KEY, cls.flush_batch_size) or []
+            ]
+            if not user_ids:
+                return written
+
+            pending_by_user = cls._pop_pending(user_ids)
+            try:
+                written += cls._write_views(pending_by_user)
+            except DatabaseError:
+                cls._buffer_again(pending_by_user)
+                raise
+
+    @classmethod
+    def _write_views(cls, pending_by_user: t.Dict[int, t.Dict[int, datetime]]) -> int:
+        from eggslist.store.models import ProductArticle, UserViewTimestamp
+
+        # Users and products may have been deleted since the view
+        existing_user_ids = set(
+            get_user_model()
+            .objects.filter(id__in=list(pending_by_user))
+            .values_list("id", flat=True)
+        )
+        existing_product_ids = set(
+            ProductArticle.objects.filter(
+                id__in={
+                    product_id for pending in pending_by_user.values() for product_id in pending
+                }
+            ).values_list("id", flat=True)
+        )
+        views = [
+            UserViewTimestamp(user_id=user_id, product_id=product_id, timestamp=timestamp)
+            for user_id, pending in pending_by_user.items()
+            if user_id in existing_user_ids
+            for product_id, timestamp in pending.items()
+            if product_id in existing_product_ids
+        ]
+        with transaction.atomic():
+            UserViewTimestamp.objects.bulk_create(
+                views,
+                batch_size=cls.flush_batch_size,
+                update_conflicts=True,
+                unique_fields=("user", "product"),
+                update_fields=("timestamp",),
+            )
+            cls._trim_views(user_ids=list(pending_by_user))
+        return len(views)
+
+    @classmethod
+    def _trim_views(cls, user_ids: t.List[int]):
+        from eggslist.store.models import UserViewTimestamp
+
+        stale_ids = list(
+            UserViewTimestamp.objects.filter(user_id__in=user_ids)
+            .annotate(
+                position=Window(
+                    RowNumber(), partition_by=F("user_id"), order_by=F("timestamp").desc()
+                )
+            )
+            .filter(position__gt=RECENTLY_VIEWED_LIMIT_PER_USER)
+            .values_list("id", flat=True)
+        )
+        UserViewTimestamp.objects.filter(id__in=stale_ids).delete()
@@ -0,0 +1,140 @@
+import random
+import secrets
+import typing as t
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_unusable_password
+from django.utils.timezone import now
+
+from eggslist.site_configuration.models import LocationCity, LocationZipCode
+from eggslist.store import models
+from eggslist.store.managers import get_search_vector
+from eggslist.users.models import UserFavoriteFarm, UserStripeConnection
+
+User = get_user_model()
+
+
+@dataclass
+class SeededCatalog:
+    """
+    Objects of a synthetic catalog which query checks and benchmarks run against
+    """
+
+    sellers: t.List
+    customer: t.Any
+    subcategories: t.List[models.Subcategory]
+    city: t.Optional[LocationCity]
+
+
+def seed_catalog(
+    products: int, sellers: int = 50, transactions: int = 500, random_seed: int = 0
+) -> SeededCatalog:
+    """
+    Bulk create a reproducible catalog: sellers spread over existing zip codes,
+    products with random prices, dates, engagement and visibility, favorite farms,
+    recently viewed products and transactions of a single customer.
+    Model signals are not sent, so run it in a transaction which is rolled back.
+    """
+    rng = random.Random(random_seed)
+    run_id = secrets.token_hex(4)
+    created_at = now()
+
+    category = models.Category.objects.create(
+        name=f"Seeded {run_id}", image="categories/seeded.jpg"
+    )
+    subcategories = [
+        models.Subcategory.objects.create(name=f"Seeded {run_id} {index}", category=category)
+        for index in range(8)
+    ]
+    zip_codes = list(
+        LocationZipCode.objects.filter(location__isnull=False)
+        .select_related("city")
+        .order_by("id")[:200]
+    )
+
+    users = User.objects.bulk_create(
+        User(
+            username=f"seeded-{run_id}-{index}",
+            email=f"seeded-{run_id}-{index}@example.com",
+            first_name=f"Seller {index}",
+            password=make_unusable_password(),
+            is_verified_seller=True,
+            zip_code=rng.choice(zip_codes) if zip_codes else None,
+        )
+        for index in range(sellers + 1)
+    )
+    customer, seller_users = users[0], users[1:]
+    stripe_connections = UserStripeConnection.objects.bulk_create(
+        UserStripeConnection(
+            user=seller,
+            stripe_account=f"acct_seeded_{run_id}_{seller.id}",
+            is_onboarding_completed=True,
+        )
+        for seller in seller_users
+    )
+
+    product_articles = []
+    for index in range(products):
+        seller = rng.choice(seller_users)
+        title = f"Seeded product {run_id} {index}"
+        product_articles.append(
+            models.ProductArticle(
+                title=title,
+                slug=f"seeded-product-{run_id}-{index}",
+                description=title,
+                subcategory=rng.choice(subcategories),
+                price=Decimal(rng.randint(100, 10000)) / 100,
+                seller=seller,
+                seller_location=seller.zip_code.location if seller.zip_code else None,
+                engagement_count=int(rng.paretovariate(1.5)) - 1,
+                is_hidden=rng.random() < 0.05,
+                is_archived=rng.random() < 0.05,
+                is_out_of_stock=rng.random() < 0.1,
+            )
+        )
+    product_articles = models.ProductArticle.objects.bulk_create(product_articles, batch_size=1000)
+    # `auto_now_add` can't be set on create, spread products over the last year afterwards
+    for product in product_articles:
+        product.date_created = created_at - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+    models.ProductArticle.objects.bulk_update(
+        product_articles, fields=("date_created",), batch_size=1000
+    )
+    # `bulk_create` skips the signal which fills `search_vector`
+    models.ProductArticle.objects.filter(subcategory__in=subcategories).update(
+        search_vector=get_search_vector()
+    )
+
+    UserFavoriteFarm.objects.bulk_create(
+        UserFavoriteFarm(user=customer, following_user=seller)
+        for seller in rng.sample(seller_users, k=min(5, len(seller_users)))
+    )
+    models.UserViewTimestamp.objects.bulk_create(
+        models.UserViewTimestamp(user=customer, product=product)
+        for product in rng.sample(product_articles, k=min(24, len(product_articles)))
+    )
+    connections_by_seller = {connection.user_id: connection for connection in stripe_connections}
+    sold_products = [rng.choice(product_articles) for _ in range(transactions)] if products else []
+    models.Transaction.objects.bulk_create(
+        (
+            models.Transaction(
+                stripe_connection=connections_by_seller[product.seller_id],
+                product=product,
+                price=product.price,
+                seller_id=product.seller_id,
+                customer=customer,
+                status=rng.choice(models.Transaction.Status.values),
+            )
+            for product in sold_products
+        ),
+        batch_size=1000,
+    )
+
+    return SeededCatalog(
+        sellers=seller_users,
+        customer=customer,
+        subcategories=subcategories,
+        city=zip_codes[0].city if zip_codes else None,
+    )
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.store.catalog_cache import bump_catalog_generation
+
+
+@receiver(post_save, sender=models.ProductArticle)
+@receiver(post_delete, sender=models.ProductArticle)
+def invalidate_catalog_cache(sender, **kwargs):
+    # After the commit, so a concurrent request can't cache the previous rows
+    # under the new generation
+    transaction.on_commit(bump_catalog_generation)
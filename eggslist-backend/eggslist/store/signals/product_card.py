@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.store.product_cards import ProductCardStorage
+from eggslist.users.models import User
+
+PRODUCT_CARD_FIELDS = {"title", "image", "slug", "price", "is_out_of_stock"}
+SELLER_CARD_FIELDS = {"first_name", "last_name", "is_verified_seller"}
+
+
+@receiver(post_save, sender=models.ProductArticle)
+@receiver(post_delete, sender=models.ProductArticle)
+def invalidate_product_card(sender, instance: models.ProductArticle, update_fields=None, **kwargs):
+    if update_fields is not None and not PRODUCT_CARD_FIELDS.intersection(update_fields):
+        return
+
+    # After the commit, so a concurrent request can't cache the previous version again
+    product_id = instance.id
+    transaction.on_commit(lambda: ProductCardStorage.invalidate_product(product_id=product_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_seller_card(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not SELLER_CARD_FIELDS.intersection(update_fields):
+        return
+
+    seller_id = instance.id
+    transaction.on_commit(lambda: ProductCardStorage.invalidate_seller(seller_id=seller_id))
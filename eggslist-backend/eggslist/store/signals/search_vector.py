@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+
+SEARCHABLE_FIELDS = {"title", "description"}
+
+
+@receiver(post_save, sender=models.ProductArticle)
+def update_search_vector(sender, instance: models.ProductArticle, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+
+    models.ProductArticle.objects.update_search_vector(product_id=instance.id)
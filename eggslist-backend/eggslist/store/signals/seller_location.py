@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from eggslist.store import models
+from eggslist.store.catalog_cache import bump_catalog_generation
+from eggslist.users.models import User
+
+
+@receiver(pre_save, sender=models.ProductArticle)
+def set_seller_location(sender, instance: models.ProductArticle, **kwargs):
+    if instance.seller_location is not None and not instance.is_seller_changed:
+        return
+
+    seller = instance.seller
+    instance.seller_location = seller.zip_code.location if seller.zip_code_id is not None else None
+    instance._loaded_seller_id = instance.seller_id
+
+
+@receiver(post_save, sender=User)
+def sync_seller_location(sender, instance: User, created: bool, **kwargs):
+    if created or not instance.is_zip_code_changed:
+        return
+
+    if models.ProductArticle.objects.update_seller_location(seller=instance):
+        transaction.on_commit(bump_catalog_generation)
+    instance._loaded_zip_code_id = instance.zip_code_id
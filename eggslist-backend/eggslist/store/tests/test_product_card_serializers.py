@@ -0,0 +1,233 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from eggslist.site_configuration.models import (
+    LocationCity,
+    LocationCountry,
+    LocationState,
+    LocationZipCode,
+)
+from eggslist.store import models
+from eggslist.store.api import serializers
+from eggslist.store.catalog_cache import bump_catalog_generation
+from eggslist.store.product_cards import ProductCardStorage
+from eggslist.users.models import UserFavoriteFarm
+
+User = get_user_model()
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class ProductCardSerializerParityTest(TestCase):
+    """
+    Catalog cards assembled by `ProductCardListSerializer` render the same JSON
+    as `ProductArticleSerializerSmall` serializing every product on its own
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        country = LocationCountry.objects.create(name="Cardland")
+        state = LocationState.objects.create(name="CT", full_name="Card State", country=country)
+        city = LocationCity.objects.create(name="Card City", state=state, location=Point(-71, 42))
+        zip_code = LocationZipCode.objects.create(name="02102", city=city, location=Point(-71, 42))
+
+        cls.seller = User.objects.create_user(
+            email="card-seller@example.com",
+            first_name="Carla",
+            last_name="Seller",
+            phone_number="+16175550101",
+            zip_code=zip_code,
+            is_email_verified=True,
+            is_verified_seller=True,
+        )
+        cls.other_seller = User.objects.create_user(
+            email="card-other-seller@example.com",
+            first_name="Oscar",
+            phone_number="+16175550102",
+            zip_code=zip_code,
+            is_email_verified=True,
+        )
+        cls.customer = User.objects.create_user(email="card-customer@example.com")
+        UserFavoriteFarm.objects.create(user=cls.customer, following_user=cls.seller)
+
+        category = models.Category.objects.create(name="Cards", image="categories/cards.jpg")
+        subcategory = models.Subcategory.objects.create(name="Card eggs", category=category)
+        cls.products = [
+            models.ProductArticle.objects.create(
+                title="Card eggs",
+                description="Eggs",
+                subcategory=subcategory,
+                price=Decimal("4.50"),
+                seller=cls.seller,
+                image="product_articles/card-eggs.jpg",
+            ),
+            # Without an image
+            models.ProductArticle.objects.create(
+                title="Card honey",
+                description="Honey",
+                subcategory=subcategory,
+                price=Decimal("12"),
+                seller=cls.seller,
+                is_out_of_stock=True,
+            ),
+            models.ProductArticle.objects.create(
+                title="Card milk",
+                description="Milk",
+                subcategory=subcategory,
+                price=Decimal("3.99"),
+                seller=cls.other_seller,
+                image="product_articles/card-milk.jpg",
+            ),
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.clear_card_cache()
+        # Anonymous catalog responses of other tests must not be served
+        bump_catalog_generation()
+
+    def clear_card_cache(self):
+        for product in self.products:
+            ProductCardStorage.invalidate_product(product_id=product.id)
+        ProductCardStorage.invalidate_sellers([self.seller.id, self.other_seller.id])
+
+    def get_request(self, user):
+        request = APIRequestFactory().get("/")
+        request.user = user
+        return request
+
+    def get_model_serializer_output(self, products, request) -> bytes:
+        """
+        Output of the serializer before the cards: every product serialized on its own
+        """
+        return render(
+            [
+                serializers.ProductArticleSerializerSmall(
+                    product, context={"request": request}
+                ).data
+                for product in products
+            ]
+        )
+
+    def get_card_output(self, products, request) -> bytes:
+        return render(
+            serializers.ProductArticleSerializerSmall(
+                products, many=True, context={"request": request}
+            ).data
+        )
+
+    def assert_same_output(self, get_products, user):
+        request = self.get_request(user)
+        expected = self.get_model_serializer_output(get_products(), request)
+
+        # Cold card cache: the cards are built from the database
+        self.assertEqual(self.get_card_output(get_products(), request), expected)
+        # Warm card cache: the cards are read from the cache
+        self.assertEqual(self.get_card_output(get_products(), request), expected)
+
+    def test_catalog_cards(self):
+        for user in (self.customer, AnonymousUser()):
+            with self.subTest(is_authenticated=user.is_authenticated):
+                self.clear_card_cache()
+                self.assert_same_output(
+                    lambda: list(
+                        models.ProductArticle.objects.get_all_catalog_no_hidden(
+                            user=user, user_id=None
+                        ).order_by("id")
+                    ),
+                    user=user,
+                )
+
+    def test_other_user_cards(self):
+        for user in (self.customer, AnonymousUser()):
+            with self.subTest(is_authenticated=user.is_authenticated):
+                self.clear_card_cache()
+                self.assert_same_output(
+                    lambda: list(
+                        models.ProductArticle.objects.get_for_other(
+                            user=user, other_user_id=self.seller.id
+                        ).order_by("id")
+                    ),
+                    user=user,
+                )
+
+    def test_cards_have_favorite_sellers(self):
+        for user, expected in (
+            (self.customer, [True, True, False]),
+            (AnonymousUser(), [False, False, False]),
+        ):
+            with self.subTest(is_authenticated=user.is_authenticated):
+                products = models.ProductArticle.objects.get_all_catalog_no_hidden(
+                    user=user, user_id=None
+                ).order_by("id")
+                cards = serializers.ProductArticleSerializerSmall(
+                    products, many=True, context={"request": self.get_request(user)}
+                ).data
+                self.assertEqual([card["seller"]["is_favorite"] for card in cards], expected)
+
+    def test_cards_have_absolute_image_urls(self):
+        request = self.get_request(AnonymousUser())
+        cards = serializers.ProductArticleSerializerSmall(
+            self.products, many=True, context={"request": request}
+        ).data
+
+        self.assertEqual(
+            [card["image"] for card in cards],
+            [
+                request.build_absolute_uri(product.image.url) if product.image else None
+                for product in self.products
+            ],
+        )
+        self.assertTrue(cards[0]["image"].startswith("http"))
+        self.assertIsNone(cards[1]["image"])
+
+    def assert_same_response(self, url: str, get_queryset, user):
+        if user.is_authenticated:
+            self.client.force_authenticate(user=user)
+        for cache_state in ("cold", "warm"):
+            with self.subTest(is_authenticated=user.is_authenticated, card_cache=cache_state):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                results = response.json()["results"]
+                products_by_slug = {product.slug: product for product in get_queryset()}
+                self.assertEqual({card["slug"] for card in results}, set(products_by_slug))
+                self.assertEqual(
+                    render(results),
+                    self.get_model_serializer_output(
+                        [products_by_slug[card["slug"]] for card in results],
+                        request=response.wsgi_request,
+                    ),
+                )
+                # Another generation, so the warm card cache is used instead of the response cache
+                bump_catalog_generation()
+
+    def test_catalog_endpoint(self):
+        for user in (self.customer, AnonymousUser()):
+            self.clear_card_cache()
+            self.assert_same_response(
+                reverse("eggslist:store:product-list"),
+                lambda: models.ProductArticle.objects.get_all_catalog_no_hidden(
+                    user=user, user_id=None
+                ),
+                user=user,
+            )
+
+    def test_other_user_endpoint(self):
+        for user in (self.customer, AnonymousUser()):
+            self.clear_card_cache()
+            self.assert_same_response(
+                reverse("eggslist:store:other-user-product", kwargs={"seller_id": self.seller.id}),
+                lambda: models.ProductArticle.objects.get_for_other(
+                    user=user, other_user_id=self.seller.id
+                ),
+                user=user,
+            )
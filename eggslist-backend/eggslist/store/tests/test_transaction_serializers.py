@@ -0,0 +1,184 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from eggslist.site_configuration.models import (
+    LocationCity,
+    LocationCountry,
+    LocationState,
+    LocationZipCode,
+)
+from eggslist.store import models
+from eggslist.store.api import serializers
+from eggslist.users.models import UserStripeConnection
+
+User = get_user_model()
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class TransactionValuesSerializerParityTest(TestCase):
+    """
+    `.values()` based transaction serializers render the same JSON
+    as the ModelSerializers they replace
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        country = LocationCountry.objects.create(name="Parityland")
+        state = LocationState.objects.create(name="PT", full_name="Parity State", country=country)
+        city = LocationCity.objects.create(
+            name="Parity City", state=state, location=Point(-71, 42)
+        )
+        zip_code = LocationZipCode.objects.create(name="02101", city=city, location=Point(-71, 42))
+
+        cls.seller = User.objects.create_user(
+            email="seller@example.com",
+            first_name="Sally",
+            last_name="Seller",
+            phone_number="+16175550100",
+            avatar="avatars/seller.jpg",
+            zip_code=zip_code,
+            is_email_verified=True,
+            is_verified_seller=True,
+        )
+        # No zip code, phone number or avatar
+        cls.other_seller = User.objects.create_user(
+            email="other-seller@example.com", first_name="Otto", is_verified_seller=True
+        )
+        cls.customer = User.objects.create_user(email="customer@example.com")
+
+        connection = UserStripeConnection.objects.create(
+            user=cls.seller, stripe_account="acct_parity_seller", is_onboarding_completed=True
+        )
+        other_connection = UserStripeConnection.objects.create(
+            user=cls.other_seller, stripe_account="acct_parity_other_seller"
+        )
+        category = models.Category.objects.create(name="Parity", image="categories/parity.jpg")
+        subcategory = models.Subcategory.objects.create(name="Parity eggs", category=category)
+        product = models.ProductArticle.objects.create(
+            title="Parity eggs",
+            description="Eggs",
+            subcategory=subcategory,
+            price=Decimal("4.50"),
+            seller=cls.seller,
+            image="product_articles/eggs.jpg",
+        )
+        product_without_image = models.ProductArticle.objects.create(
+            title="Parity honey",
+            description="Honey",
+            subcategory=subcategory,
+            price=Decimal("12"),
+            seller=cls.seller,
+        )
+
+        for index, (status, transaction_product) in enumerate(
+            (
+                (models.Transaction.Status.SUCCESS, product),
+                (models.Transaction.Status.FAILED, product_without_image),
+                (models.Transaction.Status.IN_PROGRESS, product),
+                (models.Transaction.Status.CHECKOUT_COMPLETED, product_without_image),
+            )
+        ):
+            models.Transaction.objects.create(
+                stripe_connection=connection,
+                product=transaction_product,
+                price=transaction_product.price,
+                application_fee=index * 3,
+                seller=cls.seller,
+                customer=cls.customer,
+                status=status,
+            )
+        # Anonymous customer, the product was removed afterwards
+        models.Transaction.objects.create(
+            stripe_connection=connection,
+            product=None,
+            price=Decimal("7.25"),
+            application_fee=3,
+            seller=cls.seller,
+            customer_email="guest@example.com",
+            status=models.Transaction.Status.SUCCESS,
+        )
+        models.Transaction.objects.create(
+            stripe_connection=other_connection,
+            product=None,
+            price=Decimal("1.99"),
+            seller=cls.other_seller,
+            customer=cls.customer,
+        )
+
+    def setUp(self):
+        self.request = APIRequestFactory().get("/")
+        self.client = APIClient()
+
+    def assert_same_output(self, values_serializer_class, queryset):
+        model_data = values_serializer_class.model_serializer_class(
+            queryset, many=True, context={"request": self.request}
+        ).data
+        values_data = values_serializer_class(
+            queryset.values(*values_serializer_class.values_fields),
+            many=True,
+            context={"request": self.request},
+        ).data
+        self.assertTrue(model_data)
+        self.assertEqual(render(values_data), render(model_data))
+
+    def test_seller_transaction_list_serializer(self):
+        self.assert_same_output(
+            serializers.SellerTransactionListValuesSerializer,
+            models.Transaction.objects.filter(seller=self.seller).order_by("id"),
+        )
+
+    def test_customer_transaction_list_serializer(self):
+        self.assert_same_output(
+            serializers.CustomerTransactionListValuesSerializer,
+            models.Transaction.objects.filter(customer=self.customer).order_by("id"),
+        )
+
+    def get_model_serializer_output(self, serializer_class, queryset) -> bytes:
+        return render(
+            serializer_class(queryset, many=True, context={"request": self.request}).data
+        )
+
+    def get_response_output(self, user, url_name: str):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse(f"eggslist:store:{url_name}"))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_seller_transactions_endpoint(self):
+        data = self.get_response_output(self.seller, "seller-transactions")
+        self.assertEqual(
+            render(data["transaction_list"]["results"]),
+            self.get_model_serializer_output(
+                serializers.SellerTransactionListSerializer,
+                models.Transaction.objects.filter(seller=self.seller).order_by("-modified_at"),
+            ),
+        )
+
+    def test_seller_recent_transactions_endpoint(self):
+        data = self.get_response_output(self.seller, "seller-recent-transaction")
+        self.assertEqual(
+            render(data),
+            self.get_model_serializer_output(
+                serializers.SellerTransactionListSerializer,
+                models.Transaction.objects.filter(seller=self.seller).order_by("-modified_at")[:3],
+            ),
+        )
+
+    def test_customer_transactions_endpoint(self):
+        data = self.get_response_output(self.customer, "customer-transactions")
+        self.assertEqual(
+            render(data["results"]),
+            self.get_model_serializer_output(
+                serializers.CustomerTransactionListSerializer,
+                models.Transaction.objects.filter(customer=self.customer).order_by("-modified_at"),
+            ),
+        )
@@ -1,14 +1,24 @@
 from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.contrib.auth.forms import UserChangeForm
+from django.db import transaction
 from django.forms import TextInput
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
+from eggslist.store.product_cards import ProductCardStorage
 from eggslist.users import constants, models
 from eggslist.utils.admin import ImageAdmin
 
 
+@admin.register(models.OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to", "subject")
+    readonly_fields = ("attempts", "last_error", "created_at", "sent_at")
+
+
 @admin.register(models.UserStripeConnection)
 class StripeConnectionAdmin(admin.ModelAdmin):
     list_display = ("stripe_account", "user", "is_onboarding_completed")
@@ -88,9 +98,13 @@ class VerifiedSellerApplicationAdmin(ImageAdmin):
     actions = ("approve", "refuse")
 
     def approve(self, request, queryset):
-        qs_users = models.User.objects.filter(id__in=queryset.values("user_id"))
+        seller_ids = list(queryset.values_list("user_id", flat=True))
         updated = queryset.update(status=constants.APPROVED)
-        qs_users.update(is_verified_seller=True, is_verified_seller_pending=False)
+        models.User.objects.filter(id__in=seller_ids).update(
+            is_verified_seller=True, is_verified_seller_pending=False
+        )
+        # `update` doesn't send `post_save`, which drops the seller part of product cards
+        transaction.on_commit(lambda: ProductCardStorage.invalidate_sellers(seller_ids))
 
         self.message_user(
             request,
@@ -104,9 +118,13 @@ class VerifiedSellerApplicationAdmin(ImageAdmin):
         )
 
     def refuse(self, request, queryset):
-        qs_users = models.User.objects.filter(id__in=queryset.values("user_id"))
+        seller_ids = list(queryset.values_list("user_id", flat=True))
         updated = queryset.update(status=constants.REFUSED)
-        qs_users.update(is_verified_seller=False, is_verified_seller_pending=False)
+        models.User.objects.filter(id__in=seller_ids).update(
+            is_verified_seller=False, is_verified_seller_pending=False
+        )
+        # `update` doesn't send `post_save`, which drops the seller part of product cards
+        transaction.on_commit(lambda: ProductCardStorage.invalidate_sellers(seller_ids))
 
         self.message_user(
             request,
@@ -115,6 +115,11 @@ class SetLocationSerializer(serializers.Serializer):
     )
 
 
+class CoordinatesSerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+
+
 class UserSerializerSmall(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -23,6 +23,7 @@ urlpatterns = [
     path("email-verify-request", views.EmailVerifyRequestAPIView.as_view(), name="email-verify-request"),
     path("email-verify-confirm", views.EmailVerifyConfirmAPIView.as_view(), name="email-verify-confirm"),
     path("locate", views.LocationAPIView.as_view(), name="locate"),
+    path("locate-by-coordinates", views.LocateByCoordinatesAPIView.as_view(), name="locate-by-coordinates"),
     path("set-location", views.SetLocationAPIView.as_view(), name="set-location"),
     path("become-verified-seller", views.BecomeVerifiedSellerAPIView.as_view(), name="become-verified-seller"),
     path("<int:following_user>/change-favorite-status", views.ChangeFavoriteStatus.as_view(), name="change-favorite-status"),
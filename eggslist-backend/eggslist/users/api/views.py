@@ -15,8 +15,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from eggslist.site_configuration.api.serializers import CityLocationSerializer
 from eggslist.site_configuration.models import LocationCity
 from eggslist.users import models
+from eggslist.users.nearest_city import find_nearest_city
 from eggslist.users.permissions import IsVerifiedSeller
 from eggslist.users.user_code_verify import PasswordResetCodeVerification, UserEmailVerification
 from eggslist.users.user_location_storage import UserLocationStorage
@@ -222,9 +224,12 @@ class LocationAPIView(AnonymousUserIdAPIMixin, RetrieveAPIView):
         return UserLocationStorage.get_user_location(user_id=self.get_user_id())
 
     def retrieve(self, request, *args, **kwargs):
-        location_instance, lookup_radius, is_undefined = UserLocationStorage.get_user_location(
+        city, lookup_radius, is_undefined = UserLocationStorage.get_user_location(
             user_id=self.get_user_id()
         )
+        location_instance = None
+        if city is not None:
+            location_instance = LocationCity.objects.filter(id=city.id).first()
         serializer = self.get_serializer(
             location_instance,
             context={"lookup_radius": lookup_radius, "is_undefined": is_undefined},
@@ -232,6 +237,27 @@ class LocationAPIView(AnonymousUserIdAPIMixin, RetrieveAPIView):
         return Response(serializer.data)
 
 
+class LocateByCoordinatesAPIView(GenericAPIView):
+    """
+    Return the closest city to the coordinates, e.g. from the browser Geolocation API.
+    The lookup uses the in-process spatial index, the database is queried only to
+    serialize the found city.
+    """
+
+    serializer_class = serializers.CoordinatesSerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        city = find_nearest_city(
+            longitude=serializer.validated_data["longitude"],
+            latitude=serializer.validated_data["latitude"],
+        )
+        if city is None:
+            raise Http404
+        return Response(CityLocationSerializer(LocationCity.objects.get(id=city.id)).data)
+
+
 class SetLocationAPIView(AnonymousUserIdAPIMixin, GenericAPIView):
     """
     Set a location for the user when user explicitly provided it
@@ -1,49 +1,128 @@
+import ipaddress
 import typing as t
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib.gis.geoip2 import GeoIP2
+from django.core.cache import cache
 from geoip2.errors import AddressNotFoundError
+from redis.exceptions import RedisError
 
 from eggslist.site_configuration.models import LocationCity
 from eggslist.users import exceptions
+from eggslist.users.ip_location_log import IPLocationLogBuffer
 from eggslist.users.models import UserIPLocationLog
+from eggslist.users.nearest_city import find_nearest_city
+from eggslist.users.user_location_storage import CityLocation
+from eggslist.utils.local_cache import LocalTTLCache
 
 if t.TYPE_CHECKING:
     from django.http import HttpRequest
 
+_IP_LOCATION_CACHE_KEY = "ip_location::network::{network}"
+_IP_LOCATION_NOT_FOUND = "not_found"
+_ip_location_local_cache = LocalTTLCache(
+    maxsize=settings.IP_LOCATION_LOCAL_CACHE_SIZE, ttl=settings.IP_LOCATION_CACHE_TIMEOUT
+)
 
-def locate_ip(ip_address: str) -> t.Optional[str]:
-    geo_locator = GeoIP2()
+
+@lru_cache(maxsize=None)
+def get_geo_locator() -> GeoIP2:
+    """
+    Open MaxMind database once per worker process. The database file is memory mapped.
+    """
+    return GeoIP2(cache=GeoIP2.MODE_MMAP)
+
+
+@lru_cache(maxsize=None)
+def get_default_location() -> CityLocation:
+    return CityLocation.from_city(
+        LocationCity.objects.get(
+            name=settings.DEFAULT_LOCATION["CITY"], state__name=settings.DEFAULT_LOCATION["STATE"]
+        )
+    )
+
+
+def get_ip_network(ip_address: str) -> str:
+    """
+    GeoIP databases resolve whole networks to the same city, so results are cached
+    by /24 (IPv4) or /48 (IPv6) network instead of a single address
+    """
+    address = ipaddress.ip_address(ip_address)
+    prefix_length = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f"{address}/{prefix_length}", strict=False))
+
+
+def log_ip_location_miss(ip_address: str, determined_city: t.Optional[str]):
+    try:
+        IPLocationLogBuffer.add(ip_address=ip_address, determined_city=determined_city)
+    except RedisError:
+        UserIPLocationLog.objects.create(ip_address=ip_address, determined_city=determined_city)
+
+
+def _locate_ip(ip_address: str) -> CityLocation:
     try:
-        location = geo_locator.city(ip_address)
+        location = get_geo_locator().city(ip_address)
     except AddressNotFoundError:
-        UserIPLocationLog.objects.create(
-            ip_address=ip_address, determined_city="GeoIP2 didn't find it"
-        )
+        log_ip_location_miss(ip_address, determined_city="GeoIP2 didn't find it")
         raise exceptions.LocationNotFound
     try:
-        user_location = LocationCity.objects.select_related("state__country").get(
-            name__iexact=location.get("city", ""), state__name__iexact=location.get("region", "")
+        return CityLocation.from_city(
+            LocationCity.objects.get_by_name(
+                location.get("city") or "", location.get("region") or ""
+            )
         )
     except LocationCity.DoesNotExist:
-        UserIPLocationLog.objects.create(
-            ip_address=ip_address,
-            determined_city=location.get("city", "LocationCity.DoesNotExist"),
+        user_location = _get_nearest_city(location)
+
+    if user_location is None:
+        log_ip_location_miss(
+            ip_address, determined_city=location.get("city", "LocationCity.DoesNotExist")
         )
         raise exceptions.LocationNotFound
 
     return user_location
 
 
-def locate_request(request: "HttpRequest") -> t.Tuple["LocationCity", bool]:
+def _get_nearest_city(location: t.Dict) -> t.Optional[CityLocation]:
+    """
+    GeoIP city names don't always match our dataset, fall back to the closest city
+    """
+    if location.get("longitude") is None or location.get("latitude") is None:
+        return None
+    return find_nearest_city(location["longitude"], location["latitude"])
+
+
+def locate_ip(ip_address: str) -> CityLocation:
+    try:
+        network = get_ip_network(ip_address)
+    except ValueError:
+        raise exceptions.LocationNotFound
+
+    cache_key = _IP_LOCATION_CACHE_KEY.format(network=network)
+    city = _ip_location_local_cache.get(cache_key)
+    if city is None:
+        city = cache.get(cache_key)
+    if city is None:
+        try:
+            city = _locate_ip(ip_address)
+        except exceptions.LocationNotFound:
+            city = _IP_LOCATION_NOT_FOUND
+        cache.set(cache_key, city, timeout=settings.IP_LOCATION_CACHE_TIMEOUT)
+    _ip_location_local_cache.set(cache_key, city)
+
+    if city == _IP_LOCATION_NOT_FOUND:
+        raise exceptions.LocationNotFound
+    return city
+
+
+def locate_request(request: "HttpRequest") -> t.Tuple[CityLocation, bool]:
     ip_address = request.META[settings.IP_ADDRESS_REQUEST_META_KEY]
     try:
         location_city = locate_ip(ip_address)
         is_undefined = False
     except exceptions.LocationNotFound:
-        location_city = LocationCity.objects.get(
-            name=settings.DEFAULT_LOCATION["CITY"], state__name=settings.DEFAULT_LOCATION["STATE"]
-        )
+        location_city = get_default_location()
         is_undefined = True
 
     return location_city, is_undefined
@@ -0,0 +1,48 @@
+import json
+import typing as t
+
+from django.db import DatabaseError
+
+from eggslist.utils.redis_client import get_redis_client
+
+
+class IPLocationLogBuffer:
+    """
+    Buffer `UserIPLocationLog` records in a Redis list instead of inserting them inside
+    of the request. Buffered records are written to the database in bulk with `flush`
+    (`manage.py flush_ip_location_logs`).
+    """
+
+    _PENDING_KEY = "ip_location_log::pending"
+    flush_batch_size = 500
+
+    @classmethod
+    def add(cls, ip_address: str, determined_city: t.Optional[str]):
+        get_redis_client().rpush(
+            cls._PENDING_KEY,
+            json.dumps({"ip_address": ip_address, "determined_city": determined_city}),
+        )
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Insert buffered records, records of a batch which failed
+        to be inserted are put back to the head of the list
+        """
+        from eggslist.users.models import UserIPLocationLog
+
+        client = get_redis_client()
+        written = 0
+        while True:
+            records = client.lpop(cls._PENDING_KEY, cls.flush_batch_size)
+            if not records:
+                return written
+
+            try:
+                UserIPLocationLog.objects.bulk_create(
+                    [UserIPLocationLog(**json.loads(record)) for record in records]
+                )
+            except DatabaseError:
+                client.lpush(cls._PENDING_KEY, *reversed(records))
+                raise
+            written += len(records)
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from eggslist.users.ip_location_log import IPLocationLogBuffer
+
+
+class Command(BaseCommand):
+    help = "Write IP location misses buffered in Redis to `UserIPLocationLog`"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running and flush every given number of seconds",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            try:
+                written = IPLocationLogBuffer.flush()
+            except DatabaseError as error:
+                if interval is None:
+                    raise
+                # Failed records are buffered again, retry on the next run
+                self.stderr.write(self.style.ERROR(f"Failed to write IP location logs: {error!r}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Written {written} IP location logs"))
+                if interval is None:
+                    return
+            time.sleep(interval)
@@ -0,0 +1,51 @@
+import contextlib
+import smtplib
+import time
+
+from django.conf import settings
+from django.core import mail
+from django.core.management.base import BaseCommand
+
+from eggslist.utils.emailing import delete_sent_emails, send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Deliver emails queued by `send_mailing`"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="Keep running and check the queue every given number of seconds",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help="Number of emails sent over a single SMTP connection",
+        )
+
+    def handle(self, *args, **options):
+        interval, batch_size = options["interval"], options["batch_size"]
+        while True:
+            processed = 0
+            # Drain the queue batch by batch over one SMTP connection,
+            # a full batch means there may be more
+            connection = mail.get_connection()
+            try:
+                while True:
+                    batch = send_queued_emails(batch_size=batch_size, connection=connection)
+                    processed += batch
+                    if batch < batch_size:
+                        break
+            finally:
+                with contextlib.suppress(smtplib.SMTPException, OSError):
+                    connection.close()
+            deleted = delete_sent_emails()
+            self.stdout.write(
+                self.style.SUCCESS(f"Processed {processed} emails, deleted {deleted} sent emails")
+            )
+            if interval is None:
+                return
+            time.sleep(interval)
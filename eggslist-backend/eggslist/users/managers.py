@@ -3,10 +3,11 @@ import secrets
 from django.apps import apps
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Exists, Manager, OuterRef, Value
 
 from eggslist.site_configuration.models import LocationZipCode
+from eggslist.store.catalog_cache import bump_catalog_generation
 
 
 class EggslistUserManager(UserManager):
@@ -39,8 +40,13 @@ class EggslistUserManager(UserManager):
         self.filter(email=email).update(is_email_verified=True)
 
     def update_location(self, email: str, zip_code_slug: str):
+        ProductArticle = apps.get_model("store.ProductArticle")
         zip_code = LocationZipCode.objects.get(slug=zip_code_slug)
         self.filter(email=email).update(zip_code=zip_code)
+        if ProductArticle.objects.filter(seller__email=email).update(
+            seller_location=zip_code.location
+        ):
+            transaction.on_commit(bump_catalog_generation)
 
     def get_queryset(self):
         return super().get_queryset().select_related("zip_code__city__state__country")
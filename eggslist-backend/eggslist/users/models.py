@@ -3,6 +3,7 @@ import typing as t
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFill
@@ -58,6 +59,17 @@ class User(AbstractUser):
         super().set_password(*args, **kwargs)
         self._set_password = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded zip code to detect location changes on save
+        instance._loaded_zip_code_id = instance.__dict__.get("zip_code_id")
+        return instance
+
+    @property
+    def is_zip_code_changed(self) -> bool:
+        return getattr(self, "_loaded_zip_code_id", None) != self.zip_code_id
+
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
@@ -154,3 +166,41 @@ class UserStripeConnection(models.Model):
 
     def __str__(self):
         return self.stripe_account
+
+
+class OutboundEmail(models.Model):
+    """
+    Rendered email waiting in the queue which `send_queued_emails` delivers
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PE", _("Pending")
+        SENT = "SE", _("Sent")
+        FAILED = "FA", _("Failed")
+
+    subject = models.CharField(verbose_name=_("subject"), max_length=255)
+    body = models.TextField(verbose_name=_("body"))
+    to = models.EmailField(verbose_name=_("to"))
+    status = models.CharField(
+        verbose_name=_("status"), max_length=2, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(verbose_name=_("attempts"), default=0)
+    last_error = models.TextField(verbose_name=_("last error"), blank=True, default="")
+    send_after = models.DateTimeField(verbose_name=_("send after"), default=timezone.now)
+    created_at = models.DateTimeField(verbose_name=_("created at"), auto_now_add=True)
+    sent_at = models.DateTimeField(verbose_name=_("sent at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("outbound email")
+        verbose_name_plural = _("outbound emails")
+        ordering = ("-created_at",)
+        indexes = (
+            models.Index(
+                fields=("send_after",),
+                name="outbound_email_pending_idx",
+                condition=models.Q(status="PE"),
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.subject} to {self.to}"
@@ -0,0 +1,172 @@
+import logging
+import math
+import threading
+import time
+import typing as t
+from collections import defaultdict
+
+from django.conf import settings
+
+from eggslist.users.user_location_storage import CityLocation
+from eggslist.utils.view_cache import get_view_cache_generation, invalidate_view_cache
+
+_NEAREST_CITY_INDEX_CACHE_KEY = "nearest_city_index"
+
+_Cell = t.Tuple[int, int]
+_IndexPoint = t.Tuple[float, float, int]
+# Keeps the number of scanned cells bounded near the poles
+_MIN_LONGITUDE_SCALE = 0.01
+
+
+class NearestCityIndex:
+    """
+    In-process uniform grid over city and zip code points. Every point refers to a city,
+    so zip codes make the index denser where cities are large. A lookup scans only the
+    cells around the query point and does not touch the database.
+    Distances are in degrees of latitude: longitude differences are scaled by
+    the cosine of the latitude, so they are close to the true distances.
+    """
+
+    def __init__(
+        self,
+        points: t.Iterable[_IndexPoint],
+        cities: t.Dict[int, t.Tuple[float, float]],
+        cell_size: float,
+    ):
+        self.cell_size = cell_size
+        self.cities = cities
+        self.cells: t.Dict[_Cell, t.List[_IndexPoint]] = defaultdict(list)
+        for point in points:
+            self.cells[self._get_cell(point[0], point[1])].append(point)
+
+    @classmethod
+    def build(cls, cell_size: float) -> "NearestCityIndex":
+        from eggslist.site_configuration.models import LocationCity, LocationZipCode
+
+        cities, points = {}, []
+        city_rows = LocationCity.objects.filter(location__isnull=False).values_list(
+            "id", "location"
+        )
+        for city_id, location in city_rows.iterator(chunk_size=5000):
+            cities[city_id] = (location.x, location.y)
+            points.append((location.x, location.y, city_id))
+
+        zip_code_rows = LocationZipCode.objects.filter(location__isnull=False).values_list(
+            "city_id", "location"
+        )
+        for city_id, location in zip_code_rows.iterator(chunk_size=5000):
+            if city_id in cities:
+                points.append((location.x, location.y, city_id))
+
+        return cls(points=points, cities=cities, cell_size=cell_size)
+
+    def _get_cell(self, longitude: float, latitude: float) -> _Cell:
+        return math.floor(longitude / self.cell_size), math.floor(latitude / self.cell_size)
+
+    def nearest(
+        self, longitude: float, latitude: float, max_distance: float
+    ) -> t.Optional[CityLocation]:
+        cell_x, cell_y = self._get_cell(longitude, latitude)
+        # A degree of longitude gets shorter away from the equator,
+        # so more cells fit within the distance along x
+        longitude_scale = max(math.cos(math.radians(latitude)), _MIN_LONGITUDE_SCALE)
+        rings_x = math.ceil(max_distance / longitude_scale / self.cell_size)
+        rings_y = math.ceil(max_distance / self.cell_size)
+        best_city_id, best_distance = None, max_distance * max_distance
+
+        for x in range(cell_x - rings_x, cell_x + rings_x + 1):
+            for y in range(cell_y - rings_y, cell_y + rings_y + 1):
+                for point_longitude, point_latitude, city_id in self.cells.get((x, y), ()):
+                    distance = ((point_longitude - longitude) * longitude_scale) ** 2 + (
+                        point_latitude - latitude
+                    ) ** 2
+                    if distance <= best_distance:
+                        best_city_id, best_distance = city_id, distance
+
+        if best_city_id is None:
+            return None
+        city_longitude, city_latitude = self.cities[best_city_id]
+        return CityLocation(id=best_city_id, longitude=city_longitude, latitude=city_latitude)
+
+
+_index: t.Optional[NearestCityIndex] = None
+_index_lock = threading.Lock()
+_is_refresher_started = False
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_nearest_city_index():
+    global _index
+
+    _index = NearestCityIndex.build(cell_size=settings.NEAREST_CITY_INDEX_CELL_SIZE)
+
+
+def invalidate_nearest_city_index():
+    """
+    Make every worker process rebuild its index within `NEAREST_CITY_INDEX_CHECK_INTERVAL`
+    """
+    invalidate_view_cache(_NEAREST_CITY_INDEX_CACHE_KEY)
+
+
+def _refresh_periodically(generation: t.Optional[int]):
+    built_at = time.monotonic()
+    while True:
+        time.sleep(settings.NEAREST_CITY_INDEX_CHECK_INTERVAL)
+        try:
+            current_generation = get_view_cache_generation(_NEAREST_CITY_INDEX_CACHE_KEY)
+            is_expired = time.monotonic() - built_at >= settings.NEAREST_CITY_INDEX_TTL
+            if current_generation == generation and not is_expired:
+                continue
+            refresh_nearest_city_index()
+            generation, built_at = current_generation, time.monotonic()
+        except Exception:
+            # Keep serving the previous index
+            logger.exception("Failed to rebuild the nearest city index")
+
+
+def start_nearest_city_index_refresher():
+    """
+    Build the index when a worker process starts (called from `wsgi.py`) and rebuild it
+    in a background thread every `NEAREST_CITY_INDEX_TTL` seconds or once
+    `invalidate_nearest_city_index` is called, so requests never wait for the index
+    """
+    global _is_refresher_started
+
+    with _index_lock:
+        if _is_refresher_started:
+            return
+        _is_refresher_started = True
+
+    generation = None
+    try:
+        generation = get_view_cache_generation(_NEAREST_CITY_INDEX_CACHE_KEY)
+        refresh_nearest_city_index()
+    except Exception:
+        # E.g. the database isn't migrated yet, the index is built on first use then
+        logger.exception("Failed to build the nearest city index")
+    threading.Thread(
+        target=_refresh_periodically, args=(generation,), name="nearest-city-index", daemon=True
+    ).start()
+
+
+def get_nearest_city_index() -> NearestCityIndex:
+    """
+    The index built on the worker start. Processes which didn't build it
+    (management commands, tests) build it on first use.
+    """
+    if _index is not None:
+        return _index
+
+    with _index_lock:
+        if _index is None:
+            refresh_nearest_city_index()
+        return _index
+
+
+def find_nearest_city(
+    longitude: float, latitude: float, max_distance: t.Optional[float] = None
+) -> t.Optional[CityLocation]:
+    if max_distance is None:
+        max_distance = settings.NEAREST_CITY_MAX_DISTANCE
+    return get_nearest_city_index().nearest(longitude, latitude, max_distance=max_distance)
@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase
+
+from eggslist.users.nearest_city import NearestCityIndex
+
+
+class NearestCityIndexTest(SimpleTestCase):
+    def build_index(self, cities):
+        return NearestCityIndex(
+            points=[(longitude, latitude, city_id) for city_id, (longitude, latitude) in cities],
+            cities=dict(cities),
+            cell_size=0.25,
+        )
+
+    def test_longitude_is_scaled_by_latitude(self):
+        # At 45°N the eastern city is 0.3 degrees of longitude (~0.21 degrees of latitude)
+        # away and the northern one is 0.25 degrees of latitude away
+        index = self.build_index([(1, (0.3, 45)), (2, (0, 45.25))])
+
+        city = index.nearest(longitude=0, latitude=45, max_distance=0.5)
+
+        self.assertEqual(city.id, 1)
+
+    def test_distant_longitude_cells_are_scanned(self):
+        # At 60°N 0.9 degrees of longitude is ~0.45 degrees of latitude
+        index = self.build_index([(1, (0.9, 60))])
+
+        city = index.nearest(longitude=0, latitude=60, max_distance=0.5)
+
+        self.assertEqual(city.id, 1)
+        self.assertEqual((city.longitude, city.latitude), (0.9, 60))
+
+    def test_city_further_than_max_distance_is_not_found(self):
+        index = self.build_index([(1, (0, 45.6))])
+
+        self.assertIsNone(index.nearest(longitude=0, latitude=45, max_distance=0.5))
@@ -1,15 +1,48 @@
 import typing as t
+from dataclasses import dataclass
+from functools import cached_property
 
+from django.conf import settings
+from django.contrib.gis.geos.point import Point
 from django.core.cache import cache
 
 from eggslist.users.api.constants import USER_LOCATION_COOKIE_AGE
+from eggslist.utils.local_cache import LocalTTLCache
 
 if t.TYPE_CHECKING:
     from eggslist.site_configuration.models import LocationCity
 
 
+@dataclass
+class CityLocation:
+    """
+    Compact replacement of `LocationCity` for location lookups:
+    only city id and coordinates are stored
+    """
+
+    id: int
+    longitude: float
+    latitude: float
+
+    @cached_property
+    def location(self) -> Point:
+        return Point(self.longitude, self.latitude, srid=4326)
+
+    @classmethod
+    def from_city(cls, city: "LocationCity") -> "CityLocation":
+        return cls(id=city.id, longitude=city.location.x, latitude=city.location.y)
+
+
 class UserLocationStorage:
+    """
+    Two-tier storage of user locations: a small in-process LRU cache in front of Redis
+    """
+
     _USER_LOCATION_CACHE_KEY = "user_location_for::user_id::{user_id}"
+    _local_cache = LocalTTLCache(
+        maxsize=settings.USER_LOCATION_LOCAL_CACHE_SIZE,
+        ttl=settings.USER_LOCATION_LOCAL_CACHE_TTL,
+    )
 
     @classmethod
     def set_user_location(
@@ -18,21 +51,43 @@ class UserLocationStorage:
         cache.set(
             key=cls._USER_LOCATION_CACHE_KEY.format(user_id=user_id),
             value={
-                "city": city_location,
+                "city_id": city_location.id,
+                "longitude": city_location.location.x,
+                "latitude": city_location.location.y,
                 "lookup_radius": lookup_radius,
                 "is_undefined": is_undefined,
             },
             timeout=USER_LOCATION_COOKIE_AGE,
         )
+        cls._local_cache.delete(user_id)
 
     @classmethod
-    def get_user_location(cls, user_id: str) -> t.Optional[t.Union["LocationCity", int]]:
+    def _load_user_location(
+        cls, user_id: str
+    ) -> t.Tuple[t.Optional[CityLocation], t.Optional[int], t.Optional[bool]]:
         cached_value = cache.get(key=cls._USER_LOCATION_CACHE_KEY.format(user_id=user_id))
         if cached_value is None:
             return None, None, None
 
-        return (
-            cached_value.get("city"),
-            cached_value.get("lookup_radius"),
-            cached_value.get("is_undefined"),
-        )
+        if "city" in cached_value:
+            # Values stored before locations were compacted keep a pickled `LocationCity`
+            city = CityLocation.from_city(cached_value["city"])
+        else:
+            city = CityLocation(
+                id=cached_value["city_id"],
+                longitude=cached_value["longitude"],
+                latitude=cached_value["latitude"],
+            )
+        return city, cached_value.get("lookup_radius"), cached_value.get("is_undefined")
+
+    @classmethod
+    def get_user_location(
+        cls, user_id: str
+    ) -> t.Tuple[t.Optional[CityLocation], t.Optional[int], t.Optional[bool]]:
+        user_location = cls._local_cache.get(user_id)
+        if user_location is None:
+            user_location = cls._load_user_location(user_id)
+            if user_location[0] is not None:
+                cls._local_cache.set(user_id, user_location)
+
+        return user_location
@@ -0,0 +1,30 @@
+from django.core.cache.backends.redis import RedisCache
+
+from eggslist.utils.request_metrics import measure
+
+
+def _measured(method_name: str):
+    def method(self, *args, **kwargs):
+        with measure("cache"):
+            return getattr(super(InstrumentedRedisCache, self), method_name)(*args, **kwargs)
+
+    method.__name__ = method_name
+    return method
+
+
+class InstrumentedRedisCache(RedisCache):
+    """
+    Django Redis cache which reports calls to the request metrics
+    """
+
+    add = _measured("add")
+    get = _measured("get")
+    set = _measured("set")
+    touch = _measured("touch")
+    delete = _measured("delete")
+    get_many = _measured("get_many")
+    has_key = _measured("has_key")
+    incr = _measured("incr")
+    set_many = _measured("set_many")
+    delete_many = _measured("delete_many")
+    clear = _measured("clear")
@@ -1,31 +1,152 @@
+import contextlib
+import itertools
+import logging
+import smtplib
+import typing as t
+from datetime import timedelta
+
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import mail
-from django.template.loader import render_to_string
+from django.db import transaction
+from django.db.models import QuerySet
+from django.template import Context
+from django.template.loader import get_template
+from django.utils import timezone
+
+from eggslist.site_configuration.branding import get_branding
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def _iter_recipients(users, email_addresses) -> t.Iterator[t.Tuple[str, t.Optional[t.Any]]]:
+    if email_addresses:
+        yield from zip(email_addresses, users or itertools.repeat(None))
+        return
+    if isinstance(users, QuerySet):
+        users = users.iterator(chunk_size=settings.EMAIL_MAILING_CHUNK_SIZE)
+    for user in users:
+        yield user.email, user
 
 
 def send_mailing(subject, mail_template, mail_object=None, users=None, email_addresses=None):
-    from eggslist.site_configuration.models import SiteBranding
+    """
+    Render the template for every recipient and put the emails in the queue.
+    `send_queued_emails` delivers them outside of the request.
+
+    The template is compiled once and rendered against a single context where
+    only the recipient is pushed, so `users` may be a queryset of thousands of users:
+    they are read and queued in chunks of `EMAIL_MAILING_CHUNK_SIZE`.
+    """
+    OutboundEmail = apps.get_model("users.OutboundEmail")
+    template = get_template(mail_template).template
+    context = Context(
+        {
+            "obj": mail_object or {},
+            "base_url": settings.SITE_URL,
+            "site_name": get_branding().site_name,
+        }
+    )
 
     emails = []
+    for email_address, user in _iter_recipients(users, email_addresses):
+        recipient_context = {"user": user} if user is not None else {}
+        with context.push(recipient_context):
+            html_msg = template.render(context)
+        emails.append(OutboundEmail(subject=subject, body=html_msg, to=email_address))
+
+        if len(emails) >= settings.EMAIL_MAILING_CHUNK_SIZE:
+            OutboundEmail.objects.bulk_create(emails)
+            emails = []
+
+    if emails:
+        OutboundEmail.objects.bulk_create(emails)
+
+
+def _get_retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def _close_connection(connection):
+    with contextlib.suppress(smtplib.SMTPException, OSError):
+        connection.close()
+
+
+def _send_queued_email(queued_email, connection):
+    """
+    Send a locked email and record the outcome on it. SMTP and network errors
+    are retried with exponential backoff until `EMAIL_QUEUE_MAX_ATTEMPTS`,
+    any other error fails the email at once so it can't block the queue.
+    """
+    OutboundEmail = apps.get_model("users.OutboundEmail")
+    queued_email.attempts += 1
+    try:
+        message = mail.message.EmailMessage(
+            subject=queued_email.subject, body=queued_email.body, to=[queued_email.to]
+        )
+        message.content_subtype = "html"
+        # Opens the connection for the first email or after a failure only
+        connection.open()
+        connection.send_messages([message])
+    except (smtplib.SMTPException, OSError) as error:
+        queued_email.last_error = repr(error)
+        if queued_email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            queued_email.status = OutboundEmail.Status.FAILED
+        else:
+            queued_email.send_after = timezone.now() + _get_retry_delay(queued_email.attempts)
+        # The connection may be broken, the next email opens a new one
+        _close_connection(connection)
+    except Exception as error:
+        logger.exception("Failed to send queued email %s", queued_email.id)
+        queued_email.last_error = repr(error)
+        queued_email.status = OutboundEmail.Status.FAILED
+        _close_connection(connection)
+    else:
+        queued_email.status = OutboundEmail.Status.SENT
+        queued_email.sent_at = timezone.now()
 
-    email_addresses = email_addresses if email_addresses else [user.email for user in users]
-    send_to_users = bool(users)
-    site_name = SiteBranding.get_solo().site_name
 
-    for i, email_address in enumerate(email_addresses):
-        context = {"obj": mail_object or {}, "base_url": settings.SITE_URL, "site_name": site_name}
+def send_queued_emails(batch_size: int, connection=None) -> int:
+    """
+    Deliver up to `batch_size` due emails over a single SMTP connection.
+    Every email is locked with SKIP LOCKED, sent and saved in its own transaction,
+    so several workers can run at once and a crash loses no more than one email.
+    Pass an open `connection` to reuse it for several batches, it's left open then.
+    """
+    OutboundEmail = apps.get_model("users.OutboundEmail")
+    owns_connection = connection is None
+    if owns_connection:
+        connection = mail.get_connection()
 
-        if send_to_users:
-            context.update(user=users[i])
+    processed = 0
+    try:
+        while processed < batch_size:
+            with transaction.atomic():
+                queued_email = (
+                    OutboundEmail.objects.select_for_update(skip_locked=True)
+                    .filter(status=OutboundEmail.Status.PENDING, send_after__lte=timezone.now())
+                    .order_by("send_after")
+                    .first()
+                )
+                if queued_email is None:
+                    break
+                _send_queued_email(queued_email, connection=connection)
+                queued_email.save(
+                    update_fields=("status", "attempts", "last_error", "send_after", "sent_at")
+                )
+            processed += 1
+    finally:
+        if owns_connection:
+            _close_connection(connection)
+    return processed
 
-        html_msg = render_to_string(mail_template, context=context)
-        email = mail.message.EmailMessage(subject=subject, body=html_msg, to=[email_address])
-        email.content_subtype = "html"
-        emails.append(email)
 
-    connection = mail.get_connection()
-    connection.send_messages(emails)
-    connection.close()
+def delete_sent_emails() -> int:
+    OutboundEmail = apps.get_model("users.OutboundEmail")
+    deleted, _ = OutboundEmail.objects.filter(
+        status=OutboundEmail.Status.SENT,
+        sent_at__lt=timezone.now() - timedelta(days=settings.EMAIL_QUEUE_KEEP_SENT_DAYS),
+    ).delete()
+    return deleted
@@ -0,0 +1,38 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from redis.client import Pipeline
+
+from eggslist.utils.request_metrics import measure
+
+
+class InstrumentedPipeline(Pipeline):
+    def execute(self, *args, **kwargs):
+        with measure("redis"):
+            return super().execute(*args, **kwargs)
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Redis client which reports commands to the request metrics.
+    A pipeline is reported as a single call.
+    """
+
+    def execute_command(self, *args, **kwargs):
+        with measure("redis"):
+            return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+@lru_cache(maxsize=None)
+def get_redis_client() -> redis.Redis:
+    """
+    Raw Redis client for data structures Django cache API doesn't provide
+    (hashes, lists, atomic renames). Uses the same Redis as `CACHES`.
+    """
+    return InstrumentedRedis.from_url(settings.REDIS_URL)
@@ -0,0 +1,53 @@
+import contextvars
+import time
+import typing as t
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+_current_metrics: contextvars.ContextVar[t.Optional["RequestMetrics"]] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Counts and wall time (in milliseconds) of DB queries, cache calls and
+    serialization of a single sampled request
+    """
+
+    counts: t.Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    durations: t.Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def record(self, kind: str, duration_ms: float):
+        self.counts[kind] += 1
+        self.durations[kind] += duration_ms
+
+
+@contextmanager
+def collect_request_metrics() -> t.Iterator[RequestMetrics]:
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def measure(kind: str):
+    """
+    Add wall time of the block to the current request metrics.
+    Does nothing when the request is not sampled.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(kind, (time.perf_counter() - started_at) * 1000)
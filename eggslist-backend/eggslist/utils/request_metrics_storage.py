@@ -0,0 +1,91 @@
+import time
+import typing as t
+from collections import defaultdict
+
+from eggslist.utils.redis_client import get_redis_client
+from eggslist.utils.request_metrics import RequestMetrics
+
+
+class RequestMetricsStorage:
+    """
+    Per-view totals of sampled requests shared by all workers (a Redis hash per view).
+    Request counts and wall time are also kept per minute in expiring hashes,
+    so recent latency can be told from the lifetime one.
+    """
+
+    _VIEW_KEY = "request_metrics::view::{view_name}"
+    _VIEWS_KEY = "request_metrics::views"
+    _BUCKET_KEY = "request_metrics::bucket::{bucket}"
+    bucket_seconds = 60
+    max_window_seconds = 60 * 60
+
+    @classmethod
+    def _get_bucket(cls, timestamp: float) -> int:
+        return int(timestamp // cls.bucket_seconds)
+
+    @classmethod
+    def add(cls, view_name: str, total_ms: float, metrics: RequestMetrics):
+        key = cls._VIEW_KEY.format(view_name=view_name)
+        pipeline = get_redis_client().pipeline(transaction=False)
+        pipeline.sadd(cls._VIEWS_KEY, view_name)
+        pipeline.hincrby(key, "requests", 1)
+        pipeline.hincrbyfloat(key, "total_ms", total_ms)
+        for kind, count in metrics.counts.items():
+            pipeline.hincrby(key, f"{kind}_count", count)
+            pipeline.hincrbyfloat(key, f"{kind}_ms", metrics.durations[kind])
+
+        bucket_key = cls._BUCKET_KEY.format(bucket=cls._get_bucket(time.time()))
+        pipeline.hincrby(bucket_key, f"{view_name}::requests", 1)
+        pipeline.hincrbyfloat(bucket_key, f"{view_name}::total_ms", total_ms)
+        pipeline.expire(bucket_key, cls.max_window_seconds + cls.bucket_seconds)
+        pipeline.execute()
+
+    @classmethod
+    def get_recent(cls, window_seconds: int) -> t.Dict[str, t.Dict[str, float]]:
+        """
+        Requests and their total wall time per view over the last `window_seconds`
+        (up to `max_window_seconds`), in whole minute buckets
+        """
+        window_seconds = min(window_seconds, cls.max_window_seconds)
+        last_bucket = cls._get_bucket(time.time())
+        buckets = range(last_bucket - window_seconds // cls.bucket_seconds, last_bucket + 1)
+        pipeline = get_redis_client().pipeline(transaction=False)
+        for bucket in buckets:
+            pipeline.hgetall(cls._BUCKET_KEY.format(bucket=bucket))
+
+        recent = defaultdict(lambda: defaultdict(float))
+        for values in pipeline.execute():
+            for field_name, value in values.items():
+                view_name, key = field_name.decode().rsplit("::", 1)
+                recent[view_name][key] += float(value)
+        return {view_name: dict(values) for view_name, values in recent.items()}
+
+    @classmethod
+    def get_all(cls) -> t.Dict[str, t.Dict[str, float]]:
+        client = get_redis_client()
+        view_names = sorted(name.decode() for name in client.smembers(cls._VIEWS_KEY))
+        pipeline = client.pipeline(transaction=False)
+        for view_name in view_names:
+            pipeline.hgetall(cls._VIEW_KEY.format(view_name=view_name))
+        return {
+            view_name: {key.decode(): float(value) for key, value in values.items()}
+            for view_name, values in zip(view_names, pipeline.execute())
+        }
+
+    @classmethod
+    def render_prometheus(cls, sample_rate: float) -> str:
+        """
+        Totals in Prometheus text exposition format. Only sampled requests are counted.
+        """
+        lines = [
+            "# TYPE eggslist_request_metrics_sample_rate gauge",
+            f"eggslist_request_metrics_sample_rate {sample_rate}",
+        ]
+        metric_lines = defaultdict(list)
+        for view_name, values in cls.get_all().items():
+            for key, value in values.items():
+                metric_lines[key].append(f'eggslist_{key}_total{{view="{view_name}"}} {value}')
+        for key in sorted(metric_lines):
+            lines.append(f"# TYPE eggslist_{key}_total counter")
+            lines.extend(metric_lines[key])
+        return "\n".join(lines) + "\n"
@@ -8,6 +8,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from eggslist.site_configuration.branding import get_branding
 from eggslist.store.models import Transaction
 from eggslist.users.models import UserStripeConnection
 from eggslist.utils.emailing import send_mailing
@@ -78,9 +79,7 @@ class StripeWebhooks(APIView):
             )
             seller_email = transaction.seller.email
             seller_name = transaction.seller.first_name
-            from eggslist.site_configuration.models import SiteBranding
-
-            site_name = SiteBranding.get_solo().site_name
+            site_name = get_branding().site_name
             send_mailing(
                 subject=f"{site_name} Notification: Sale!",
                 mail_template="emails/stripe_purchase_seller.html",
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 
+from eggslist.site_configuration.branding import get_branding
 from eggslist.utils.emailing import send_mailing
 
 User = get_user_model()
@@ -55,9 +56,7 @@ class EmailCodeVerification:
         code = cls.generate_code(email=email)
         user_code_link = f"{settings.SITE_URL}/{cls.link_endpoint}?{cls.link_param_key}={code}"
 
-        from eggslist.site_configuration.models import SiteBranding
-
-        site_name = SiteBranding.get_solo().site_name
+        site_name = get_branding().site_name
         subject = cls.mail_subject.replace("Eggslist", site_name)
 
         send_mailing(
@@ -0,0 +1,29 @@
+import hashlib
+
+from django.core.cache import cache
+
+_VIEW_CACHE_GENERATION_KEY = "view_cache_generation:{cache_key}"
+
+
+def get_view_cache_generation(cache_key: str) -> int:
+    return cache.get(_VIEW_CACHE_GENERATION_KEY.format(cache_key=cache_key), 0)
+
+
+def invalidate_view_cache(*cache_keys: str):
+    """
+    Drop cached responses of the views with given `cache_key`s
+    by moving them to the next generation
+    """
+    for cache_key in cache_keys:
+        generation_key = _VIEW_CACHE_GENERATION_KEY.format(cache_key=cache_key)
+        try:
+            cache.incr(generation_key)
+        except ValueError:
+            cache.set(generation_key, 1, timeout=None)
+
+
+def get_query_fingerprint(query_params) -> str:
+    query = sorted(
+        (key, value) for key, values in query_params.lists() for value in values if value != ""
+    )
+    return hashlib.sha1(repr(query).encode("utf-8")).hexdigest()
@@ -1,22 +1,133 @@
+import gzip
+import hashlib
+import typing as t
+
 from django.conf import settings
 from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from eggslist.utils import constants
+from eggslist.utils.view_cache import get_query_fingerprint, get_view_cache_generation
 
 
 class CacheListAPIMixin:
+    """
+    Cache rendered JSON of list responses per normalized query string and serve
+    the bytes as is. Set `cache_gzip` to keep large responses compressed.
+    Call `invalidate_view_cache(cache_key)` when the underlying data changes.
+    """
+
     cache_key = None
+    cache_gzip = False
     timeout = constants.ONE_HOUR
 
-    def get_queryset(self, *args, **kwargs):
-        qs = cache.get(f"view_cache:{self.cache_key}")
+    def get_list_cache_key(self) -> str:
+        return (
+            f"view_cache:{self.cache_key}:{get_view_cache_generation(self.cache_key)}:"
+            f"{get_query_fingerprint(self.request.query_params)}"
+        )
+
+    def get_cached_response(self, content: bytes) -> HttpResponse:
+        response = HttpResponse(content_type=self.request.accepted_media_type)
+        if self.cache_gzip:
+            response["Vary"] = "Accept-Encoding"
+            if "gzip" in self.request.META.get("HTTP_ACCEPT_ENCODING", ""):
+                response["Content-Encoding"] = "gzip"
+            else:
+                content = gzip.decompress(content)
+        response.content = content
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, "format", None) != "json":
+            return super().list(request, *args, **kwargs)
+
+        cache_key = self.get_list_cache_key()
+        content = cache.get(cache_key)
+        if content is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            content = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            if self.cache_gzip:
+                content = gzip.compress(content)
+            cache.set(cache_key, content, timeout=self.timeout)
+
+        return self.get_cached_response(content)
+
+
+class AnonymousResponseCacheAPIMixin:
+    """
+    Cache list responses for anonymous users. Cache key is built from the normalized
+    query string, the host and `get_response_cache_vary` values. Bump the value
+    returned by `get_response_cache_generation` to invalidate all of the entries.
+    """
+
+    response_cache_key = None
+    response_cache_timeout = 60 * 5
+
+    def get_response_cache_generation(self) -> int:
+        return 0
+
+    def get_response_cache_vary(self) -> t.Tuple:
+        return ()
+
+    def get_response_cache_key(self) -> str:
+        fingerprint = repr(
+            (
+                self.request.get_host(),
+                self.get_response_cache_vary(),
+                get_query_fingerprint(self.request.query_params),
+            )
+        )
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+        return (
+            f"response_cache::{self.response_cache_key}::"
+            f"{self.get_response_cache_generation()}::{digest}"
+        )
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        cache_key = self.get_response_cache_key()
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, timeout=self.response_cache_timeout)
+        return response
+
+
+class KeysetPaginationAPIMixin:
+    """
+    Paginate with `keyset_pagination_class` instead of `pagination_class`
+    when a client asks for it with `?pagination=cursor`
+    """
+
+    keyset_pagination_class = None
+    keyset_pagination_query_param = "pagination"
+    keyset_pagination_query_value = "cursor"
 
-        if not qs:
-            qs = super().get_queryset(*args, **kwargs)
-            cache.set(f"view_cache:{self.cache_key}", qs, timeout=self.timeout)
+    @property
+    def is_keyset_paginated(self) -> bool:
+        return (
+            self.keyset_pagination_class is not None
+            and self.request.query_params.get(self.keyset_pagination_query_param)
+            == self.keyset_pagination_query_value
+        )
 
-        return qs
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.is_keyset_paginated:
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
 
 
 class AnonymousUserIdAPIMixin:
@@ -1,7 +1,17 @@
+import base64
+import json
+import math
+import typing as t
 from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
 
+from django.db.models import Q, QuerySet
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class PageNumberPaginationWithCount(pagination.PageNumberPagination):
@@ -20,3 +30,154 @@ class PageNumberPaginationWithCount(pagination.PageNumberPagination):
                 ("results", data),
             ]
         )
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Seek pagination over the queryset ordering. A cursor holds ordering values of the
+    last (or the first) item of the page, so every page is fetched with an indexed
+    `WHERE (...) > (...)` condition instead of `OFFSET`. `tie_breaker` is always added
+    to the ordering to make it total. Total count is returned unless a client asks
+    not to with `?with_count=false`.
+    """
+
+    page_size = 12
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    tie_breaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> t.List:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.count = self.get_count(queryset) if self.is_count_requested(request) else None
+
+        cursor_values, self.is_reversed = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.get_query_ordering())
+        if cursor_values is not None:
+            queryset = queryset.filter(self.get_seek_condition(cursor_values))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.is_reversed:
+            results.reverse()
+            self.has_next, self.has_previous = cursor_values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor_values is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_dict(data))
+
+    def get_paginated_dict(self, data):
+        paginated = OrderedDict()
+        if self.count is not None:
+            paginated["total_pages"] = math.ceil(self.count / self.page_size)
+            paginated["count"] = self.count
+        paginated["next"] = self.get_next_link()
+        paginated["previous"] = self.get_previous_link()
+        paginated["results"] = data
+        return paginated
+
+    def is_count_requested(self, request) -> bool:
+        return request.query_params.get(self.count_query_param, "true").lower() not in (
+            "false",
+            "0",
+        )
+
+    def get_count(self, queryset: QuerySet) -> int:
+        return queryset.order_by().count()
+
+    def get_ordering(self, queryset: QuerySet) -> t.List[str]:
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not any(field.lstrip("-") in (self.tie_breaker, "pk") for field in ordering):
+            ordering.append(self.tie_breaker)
+        return ordering
+
+    def get_query_ordering(self) -> t.List[str]:
+        if not self.is_reversed:
+            return self.ordering
+        return [field[1:] if field.startswith("-") else f"-{field}" for field in self.ordering]
+
+    def get_seek_condition(self, cursor_values: t.List) -> Q:
+        """
+        Build `(a, b, c) > (x, y, z)` condition respecting each field direction:
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`
+        """
+        conditions = []
+        for position, field in enumerate(self.get_query_ordering()):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                previous.lstrip("-"): cursor_values[index]
+                for index, previous in enumerate(self.ordering[:position])
+            }
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": cursor_values[position]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    def get_item_values(self, item) -> t.List:
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if name == "pk":
+                value = item.pk
+            elif hasattr(item, name):
+                value = getattr(item, name)
+            else:
+                value = reduce(getattr, name.split("__"), item)
+            values.append(self.encode_value(name, value))
+        return values
+
+    def encode_value(self, field_name: str, value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def decode_value(self, field_name: str, value):
+        return value
+
+    def encode_cursor(self, item, is_reversed: bool) -> str:
+        payload = json.dumps({"v": self.get_item_values(item), "r": is_reversed})
+        cursor = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request) -> t.Tuple[t.Optional[t.List], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            values, is_reversed = payload["v"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        values = [
+            self.decode_value(field.lstrip("-"), value)
+            for field, value in zip(self.ordering, values)
+        ]
+        return values, is_reversed
+
+    def get_next_link(self) -> t.Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], is_reversed=False)
+
+    def get_previous_link(self) -> t.Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], is_reversed=True)